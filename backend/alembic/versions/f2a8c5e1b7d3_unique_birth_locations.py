@@ -0,0 +1,55 @@
+"""unique birth_locations
+
+Revision ID: f2a8c5e1b7d3
+Revises: e4b7c1d9f2a6
+Create Date: 2026-10-15 11:04:27.519380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c5e1b7d3'
+down_revision: Union[str, None] = 'e4b7c1d9f2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse existing duplicates onto the lowest id before the constraint can be created
+    op.execute(
+        """
+        UPDATE players AS p
+           SET birth_location_id = d.keep_id
+          FROM (
+                SELECT id,
+                       min(id) OVER (PARTITION BY city, state_province, country) AS keep_id
+                  FROM birth_locations
+               ) AS d
+         WHERE p.birth_location_id = d.id
+           AND d.id <> d.keep_id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM birth_locations AS b
+         USING birth_locations AS k
+         WHERE b.city = k.city
+           AND b.state_province IS NOT DISTINCT FROM k.state_province
+           AND b.country = k.country
+           AND b.id > k.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_birth_locations_city_state_country',
+        'birth_locations',
+        ['city', 'state_province', 'country'],
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_birth_locations_city_state_country', 'birth_locations', type_='unique')
@@ -1,14 +1,12 @@
-from typing import List, Dict
+from typing import List, Dict, Set
 from src.database.models import Card, Pitch
 from src.adapters.base import BaseAdapter
 
 class CardAdapter(BaseAdapter):
     
-    def __init__(self, series_map: Dict, quirk_map: Dict, location_map: Dict):
+    def __init__(self, series_names: Set[str]):
         super().__init__()
-        self.series_map = series_map
-        self.quirk_map = quirk_map
-        self.location_map = location_map
+        self.series_names = series_names
 
     def _card_id(self, year: int, source_uuid: str) -> str:
         return f"{year}:{source_uuid}"
@@ -89,25 +87,9 @@ class CardAdapter(BaseAdapter):
             card.ui_anim_index = self._json_get(item, "ui_anim_index", 0) or 0
 
             series_name = self._json_get(item, "series", "")
-            if series_name and series_name in self.series_map:
+            if series_name and series_name in self.series_names:
                 card.series_name = series_name
-                card.series = self.series_map[series_name]
             
-            item_quirks = self._json_get(item, "quirks", [])
-            card_quirks = []
-            for q in item_quirks:
-                q_name = q.get("name")
-                if q_name and q_name in self.quirk_map:
-                    card_quirks.append(self.quirk_map[q_name])
-            card.quirks = card_quirks
-
-            item_locs = self._json_get(item, "locations", [])
-            card_locs = []
-            for l_name in item_locs:
-                if l_name and l_name in self.location_map:
-                    card_locs.append(self.location_map[l_name])
-            card.locations = card_locs
-
             item_pitches = self._json_get(item, "pitches", [])
             pitch_objs = []
             for p in item_pitches:
@@ -29,12 +29,18 @@ class MLBPlayByPlayBaserunningAggregator:
         self._lines: Dict[Tuple[int, int], BaserunningLine] = {}
 
     def build_rows(self, game_id: int, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self._lines.clear()
+        self.reset()
 
         plays = payload.get("allPlays") or []
         for play in plays:
-            self._process_play(game_id, play)
+            self.process_play(game_id, play)
+
+        return self.rows()
+
+    def reset(self) -> None:
+        self._lines.clear()
 
+    def rows(self) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         for (g, pid), line in self._lines.items():
             if line.sb > 0 or line.caught_stealing > 0:
@@ -47,7 +53,7 @@ class MLBPlayByPlayBaserunningAggregator:
             self._lines[key] = BaserunningLine()
         return self._lines[key]
 
-    def _process_play(self, game_id: int, play: Dict[str, Any]) -> None:
+    def process_play(self, game_id: int, play: Dict[str, Any]) -> None:
         runners = play.get("runners") or []
         
         for r in runners:
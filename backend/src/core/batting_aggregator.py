@@ -146,31 +146,40 @@ class MLBPlayByPlayBattingAggregator:
         self._lines: Dict[Tuple[int, int, str], BatLine] = {}
 
     def build_rows(self, game_id: int, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self._lines.clear()
+        self.reset()
 
         plays = payload.get("allPlays") or []
         for play in plays:
-            if not _is_pa_play(play):
-                continue
+            self.process_play(game_id, play)
+
+        return self.rows()
+
+    def reset(self) -> None:
+        self._lines.clear()
+
+    def process_play(self, game_id: int, play: Dict[str, Any]) -> None:
+        if not _is_pa_play(play):
+            return
 
-            matchup = play.get("matchup") or {}
-            batter = matchup.get("batter") or {}
-            batter_id = batter.get("id")
+        matchup = play.get("matchup") or {}
+        batter = matchup.get("batter") or {}
+        batter_id = batter.get("id")
 
-            vs_split = _pitcher_hand_split(play)
-            if vs_split is None:
-                continue
+        vs_split = _pitcher_hand_split(play)
+        if vs_split is None:
+            return
 
-            risp = _is_risp_start(play)
+        risp = _is_risp_start(play)
 
-            self._apply_batter_stats(game_id, int(batter_id), vs_split, play)
-            if risp:
-                self._apply_batter_stats(game_id, int(batter_id), SPLIT_RISP, play)
+        self._apply_batter_stats(game_id, int(batter_id), vs_split, play)
+        if risp:
+            self._apply_batter_stats(game_id, int(batter_id), SPLIT_RISP, play)
 
-            self._apply_scoring(game_id, vs_split, play)
-            if risp:
-                self._apply_scoring(game_id, SPLIT_RISP, play)
+        self._apply_scoring(game_id, vs_split, play)
+        if risp:
+            self._apply_scoring(game_id, SPLIT_RISP, play)
 
+    def rows(self) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         for (g, pid, split), line in self._lines.items():
             out.append(line.to_row(g, pid, split))
@@ -1,4 +1,6 @@
 # SET UP PYTHON VARIABLES
+import os
+import tempfile
 
 
 THE_SHOW_YEARS = [25, 24, 23, 22, 21]
@@ -18,4 +20,8 @@ FIELDING_ROSTER_UPDATES = {
     23: [14, 25],
     22: [12],
     21: [10]
-}
\ No newline at end of file
+}
+
+# On-disk ETag cache for The Show item pages, so reruns only re-download pages that changed.
+# Defaults to the temp dir since the app user can't write under /app in the image.
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(tempfile.gettempdir(), "diamondinsights", "http_cache.sqlite3"))
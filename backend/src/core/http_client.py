@@ -1,3 +1,4 @@
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -6,15 +7,20 @@ import random
 import time
 from typing import Any, Dict, Optional
 
+from src.core.response_cache import ResponseCache
+
 class APIClient:
     def __init__(self, 
                 base_url: str = "",
                 retries: int = 3, 
                 backoff: float = 0.5,
                 rate_limit_retries: int = 7,
-                rate_limit_cap_s: float = 30.0):
+                rate_limit_cap_s: float = 30.0,
+                cache: Optional[ResponseCache] = None,
+                pool_maxsize: int = 32):
         
         self.base_url = base_url
+        self.cache = cache
         self.logger = logging.getLogger(__name__)
         self.rate_limit_retries = rate_limit_retries
         self.rate_limit_cap_s = rate_limit_cap_s
@@ -31,7 +37,8 @@ class APIClient:
             raise_on_status=False
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Sized for the jobs' worker pools so concurrent threads reuse connections instead of discarding them
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_maxsize)
         
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
@@ -40,12 +47,36 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
 
         for attempt in range(self.rate_limit_retries + 1):
-            response = self.session.get(url, params=params, timeout=40)
+            headers = self.cache.conditional_headers(url, params) if self.cache else None
+            response = self.session.get(url, params=params, headers=headers, timeout=40)
+
+            if response.status_code == 304:
+                cached = self.cache.load(url, params) if self.cache else None
+                if cached is not None:
+                    return orjson.loads(cached)
+
+                # The cached body went missing after the conditional headers were built; a 304 has no body
+                # to fall back on, so fetch the full response unconditionally
+                self.logger.warning(f"304 for {url} with no cached body; refetching without validators")
+                response = self.session.get(url, params=params, timeout=40)
+                if response.status_code == 304:
+                    raise requests.exceptions.HTTPError(
+                        f"Unexpected 304 without conditional headers for {url}", response=response
+                    )
 
             if response.status_code != 429:
                 try:
                     response.raise_for_status()
-                    return response.json()
+                    data = orjson.loads(response.content)
+                    if self.cache:
+                        self.cache.store(
+                            url,
+                            params,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                            response.content,
+                        )
+                    return data
                 except requests.exceptions.HTTPError as e:
                     self.logger.error(f"HTTP Error: {response.status_code} for {url}")
                     raise
@@ -76,4 +107,6 @@ class APIClient:
         raise RuntimeError("unreachable")
             
     def close(self):
-        self.session.close()
\ No newline at end of file
+        self.session.close()
+        if self.cache:
+            self.cache.close()
\ No newline at end of file
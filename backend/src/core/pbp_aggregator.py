@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from src.core.batting_aggregator import MLBPlayByPlayBattingAggregator
+from src.core.baserunning_aggregator import MLBPlayByPlayBaserunningAggregator
+from src.core.pitching_aggregator import MLBPlayByPlayPitchingAggregator
+
+
+def build_all_rows(
+    game_id: int,
+    payload: Dict[str, Any],
+    batting: MLBPlayByPlayBattingAggregator,
+    baserunning: MLBPlayByPlayBaserunningAggregator,
+    pitching: MLBPlayByPlayPitchingAggregator,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Feeds every play to all three aggregators in a single walk over allPlays."""
+    batting.reset()
+    baserunning.reset()
+    pitching.reset()
+
+    batting_play = batting.process_play
+    baserunning_play = baserunning.process_play
+    pitching_play = pitching.process_play
+
+    for play in payload.get("allPlays") or []:
+        batting_play(game_id, play)
+        baserunning_play(game_id, play)
+        pitching_play(game_id, play)
+
+    return batting.rows(), baserunning.rows(), pitching.rows()
@@ -216,44 +216,53 @@ class MLBPlayByPlayPitchingAggregator:
         self._runners_on_base_ids: Set[int] = set()
 
     def build_rows(self, game_id: int, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        self._lines.clear()
-        self._runner_splits.clear()
-        self._runners_on_base_ids.clear()
-        self._current_pitcher_id = None
+        self.reset()
 
         plays = payload.get("allPlays") or []
         for play in plays:
-            pid = _pitcher_id(play)
-            if pid is None:
-                continue
-            
-            # --- 1. Handle Pitching Change & Inherited Runners Count ---
-            if self._current_pitcher_id is None:
-                self._current_pitcher_id = pid
-            elif pid != self._current_pitcher_id:
-                # Pitcher changed. The new pitcher inherits everyone currently on base.
-                inherited_count = len(self._runners_on_base_ids)
-                if inherited_count > 0:
-                    # We attribute the "Inherited Runners" count to the new pitcher's "Total" context
-                    # Since we don't know the batter split yet, we can't perfectly assign it to vslhb/vsrhb.
-                    # Ideally, we assign it to the split of the *first batter they face*.
-                    # For simplicity, we'll try to guess based on the current batter.
-                    split_guess = _batter_hand_split(play)
-                    line = self._line(game_id, pid, split_guess)
-                    line.inherited_runners += inherited_count
-                self._current_pitcher_id = pid
-
-            # --- 2. Process Play Stats ---
-            if _is_bf_play(play):
-                self._process_bf_play(game_id, play)
-            else:
-                self._process_non_bf_play(game_id, play)
+            self.process_play(game_id, play)
 
-            # --- 3. Update Runner State for Next Play ---
-            # We must look at the "runners" list (which shows the result state) 
-            # to know who is left on base for the *next* play.
-            self._update_on_base_state(play)
+        return self.rows()
 
+    def reset(self) -> None:
+        self._lines.clear()
+        self._runner_splits.clear()
+        self._runners_on_base_ids.clear()
+        self._current_pitcher_id = None
+
+    def process_play(self, game_id: int, play: Dict[str, Any]) -> None:
+        pid = _pitcher_id(play)
+        if pid is None:
+            return
+        
+        # --- 1. Handle Pitching Change & Inherited Runners Count ---
+        if self._current_pitcher_id is None:
+            self._current_pitcher_id = pid
+        elif pid != self._current_pitcher_id:
+            # Pitcher changed. The new pitcher inherits everyone currently on base.
+            inherited_count = len(self._runners_on_base_ids)
+            if inherited_count > 0:
+                # We attribute the "Inherited Runners" count to the new pitcher's "Total" context
+                # Since we don't know the batter split yet, we can't perfectly assign it to vslhb/vsrhb.
+                # Ideally, we assign it to the split of the *first batter they face*.
+                # For simplicity, we'll try to guess based on the current batter.
+                split_guess = _batter_hand_split(play)
+                line = self._line(game_id, pid, split_guess)
+                line.inherited_runners += inherited_count
+            self._current_pitcher_id = pid
+
+        # --- 2. Process Play Stats ---
+        if _is_bf_play(play):
+            self._process_bf_play(game_id, play)
+        else:
+            self._process_non_bf_play(game_id, play)
+
+        # --- 3. Update Runner State for Next Play ---
+        # We must look at the "runners" list (which shows the result state) 
+        # to know who is left on base for the *next* play.
+        self._update_on_base_state(play)
+
+    def rows(self) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         for (g, p_id, split), line in self._lines.items():
             if (
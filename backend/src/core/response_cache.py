@@ -0,0 +1,87 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+class ResponseCache:
+    """Disk cache of raw response bodies, revalidated with ETag / Last-Modified.
+
+    Lookups and writes that fail on the sqlite side behave as a miss, so a broken cache file only costs
+    full downloads.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _key(self, url: str, params: Optional[Dict[str, Any]]) -> str:
+        return url + "?" + orjson.dumps(params or {}, option=orjson.OPT_SORT_KEYS, default=str).decode()
+
+    def conditional_headers(self, url: str, params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT etag, last_modified FROM responses WHERE key = ?", (self._key(url, params),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"HTTP cache lookup failed for {url}: {e}")
+            return {}
+
+        headers: Dict[str, str] = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def load(self, url: str, params: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT body FROM responses WHERE key = ?", (self._key(url, params),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"HTTP cache read failed for {url}: {e}")
+            return None
+        return row[0] if row else None
+
+    def store(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: bytes,
+    ) -> None:
+        if not etag and not last_modified:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                    (self._key(url, params), etag, last_modified, body),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"HTTP cache write failed for {url}: {e}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
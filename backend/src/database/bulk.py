@@ -0,0 +1,127 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+from sqlalchemy import Table
+
+COPY_NULL = "\\N"
+# Below this many rows the temp table + COPY round trips cost more than one multi-row VALUES insert
+COPY_MIN_ROWS = 1000
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class CopyUpsertBuffer:
+    """Buffers rows as value tuples and upserts them into ``table`` on flush.
+
+    Large flushes go through COPY into a temp staging table; small ones use psycopg2's execute_values.
+    ``update_set`` overrides the default ``EXCLUDED.<col>`` assignment for individual update columns, and
+    ``update_where`` restricts which conflicting rows are actually rewritten. Passing ``columns`` fixes the
+    column order up front, which lets callers hand over positional tuples via ``extend_tuples``.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+        copy_min_rows: int = COPY_MIN_ROWS,
+        update_set: Optional[Dict[str, str]] = None,
+        update_where: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+    ):
+        self.table = table
+        self.conflict_cols = list(conflict_cols)
+        self.update_cols = list(update_cols) if update_cols is not None else None
+        self.copy_min_rows = copy_min_rows
+        self.update_set = dict(update_set or {})
+        self.update_where = update_where
+
+        self._cols: Optional[List[str]] = None
+        self._reset()
+        if columns is not None:
+            self._prepare(list(columns))
+
+    def _reset(self) -> None:
+        self._rows: List[Tuple[Any, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _prepare(self, cols: List[str]) -> None:
+        update_cols = self.update_cols
+        if update_cols is None:
+            update_cols = [c for c in cols if c not in self.conflict_cols]
+
+        stage = _quote(f"stg_{self.table.name}")
+        target = _quote(self.table.name)
+        col_list = ", ".join(_quote(c) for c in cols)
+
+        if update_cols:
+            conflict_action = "DO UPDATE SET " + ", ".join(
+                f"{_quote(c)} = {self.update_set.get(c, f'EXCLUDED.{_quote(c)}')}" for c in update_cols
+            )
+            if self.update_where:
+                conflict_action += f" WHERE {self.update_where}"
+        else:
+            conflict_action = "DO NOTHING"
+
+        self._cols = cols
+        # Create-if-missing and empty the staging table in a single round trip
+        self._stage_sql = (
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} (LIKE {target} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS; "
+            f"TRUNCATE {stage}"
+        )
+        self._copy_sql = f"COPY {stage} ({col_list}) FROM STDIN WITH (FORMAT CSV, NULL '{COPY_NULL}')"
+        on_conflict = f"ON CONFLICT ({', '.join(_quote(c) for c in self.conflict_cols)}) {conflict_action}"
+        self._merge_sql = f"INSERT INTO {target} ({col_list}) SELECT {col_list} FROM {stage} {on_conflict}"
+        self._values_sql = f"INSERT INTO {target} ({col_list}) VALUES %s {on_conflict}"
+
+    def extend(self, rows: Iterable[Dict[str, Any]]) -> None:
+        append = self._rows.append
+        cols = self._cols
+        for row in rows:
+            if cols is None:
+                self._prepare([c.name for c in self.table.columns if c.name in row])
+                cols = self._cols
+            append(tuple(map(row.get, cols)))
+
+    def extend_tuples(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        if self._cols is None:
+            raise ValueError(f"{self.table.name}: extend_tuples needs the buffer's columns up front")
+        self._rows.extend(rows)
+
+    def flush(self, db_session) -> int:
+        rows = self._rows
+        count = len(rows)
+        if not count:
+            return 0
+
+        # Flush pending ORM state so the raw cursor sees the same transaction contents
+        db_session.flush()
+        cursor = db_session.connection().connection.cursor()
+        try:
+            if count >= self.copy_min_rows:
+                self._copy_merge(cursor, rows)
+            else:
+                execute_values(cursor, self._values_sql, rows, page_size=1000)
+        finally:
+            cursor.close()
+            self._reset()
+
+        return count
+
+    def _copy_merge(self, cursor, rows: List[Tuple[Any, ...]]) -> None:
+        """COPY rows into a temp staging table, then merge with one INSERT ... SELECT ... ON CONFLICT."""
+        buf = io.StringIO()
+        writerow = csv.writer(buf).writerow
+        for r in rows:
+            writerow([COPY_NULL if v is None else v for v in r])
+        buf.seek(0)
+
+        cursor.execute(self._stage_sql)
+        cursor.copy_expert(self._copy_sql, buf)
+        cursor.execute(self._merge_sql)
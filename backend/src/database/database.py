@@ -10,7 +10,16 @@ POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
 SQLALCHEMY_DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# INSERT executemany is rewritten into multi-row VALUES pages; UPDATE/DELETE executemany goes through
+# psycopg2's execute_batch instead of one round trip per parameter set. Pooled connections outlive a
+# single job under the scheduler, so they are checked before reuse.
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
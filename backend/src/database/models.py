@@ -207,7 +207,8 @@ class CompletedOrder(Base):
     __tablename__ = "completed_orders"
 
     card_id: Mapped[str] = mapped_column(ForeignKey("listings.card_id"), primary_key=True)
-    date: Mapped[datetime.datetime] = mapped_column(primary_key=True)
+    # Indexed on its own for the 48h prune and the daily candle window
+    date: Mapped[datetime.datetime] = mapped_column(primary_key=True, index=True)
     price: Mapped[int] = mapped_column()
     is_buy: Mapped[Optional[bool]] = mapped_column()
 
@@ -354,6 +355,16 @@ class Player(Base):
     
 class BirthLocation(Base):
     __tablename__ = "birth_locations"
+    # NULL states compare equal so the (city, NULL, country) rows stay unique too
+    __table_args__ = (
+        UniqueConstraint(
+            "city",
+            "state_province",
+            "country",
+            name="uq_birth_locations_city_state_country",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     city: Mapped[str] = mapped_column()
@@ -1,13 +1,28 @@
+import sqlite3
+
 from src.jobs.base import BaseJob
-from src.core.config import THE_SHOW_YEARS
+from src.core.config import THE_SHOW_YEARS, HTTP_CACHE_PATH
+from src.core.http_client import APIClient
+from src.core.response_cache import ResponseCache
 from src.adapters.card_adapter import CardAdapter
-from src.database.models import Series, Quirk, Location, Card
-
-from typing import List, Dict
-from sqlalchemy import select, text, inspect as sa_inspect
+from src.database.models import (
+    Series,
+    Quirk,
+    Location,
+    Card,
+    card_quirk_association,
+    card_location_association,
+)
+
+from typing import Any, Dict, Iterator, List, Set, Tuple
+from sqlalchemy import text, inspect as sa_inspect
 from sqlalchemy.dialects.postgresql import insert
-import time
-import random
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+
+
+_EMPTY = ()
+PAGE_WORKERS = 4
 
 
 class CardSync(BaseJob):
@@ -15,6 +30,14 @@ class CardSync(BaseJob):
         super().__init__()
         self.set_child_instance(self)
         self.reload_all_years = reload_all_years
+        try:
+            cache = ResponseCache(HTTP_CACHE_PATH)
+        except (OSError, sqlite3.Error) as e:
+            # The cache only saves downloads; without it every page is fetched in full
+            self.logger.warning(f"HTTP cache unavailable at {HTTP_CACHE_PATH}, syncing without it: {e}")
+        else:
+            self.api_client.close()
+            self.api_client = APIClient(cache=cache)
 
     def execute(self, db_session):
         self.logger.info("Starting CardSync Execute...")
@@ -22,142 +45,191 @@ class CardSync(BaseJob):
         years_to_process = THE_SHOW_YEARS if self.reload_all_years else [THE_SHOW_YEARS[0]]
 
         raw_items_map = {}
-        for year in years_to_process:
-            self.logger.info(f"Fetching data for year {year}")
-            url = f"https://mlb{year}.theshow.com/apis/items.json"
-            params = {"type": "mlb_card"}
-            data = self.fetch_paginated_data(url, params)
-
-            for item in data:
-                source_uuid = item.get("uuid")
-                if not source_uuid:
-                    continue
-                    
-                derived_id = f"{year}:{source_uuid}"
-                raw_items_map[derived_id] = item
-                raw_items_map[derived_id]["year"] = year
-                raw_items_map[derived_id]["source_uuid"] = source_uuid
+        with ThreadPoolExecutor(max_workers=len(years_to_process)) as pool:
+            for year, items in zip(years_to_process, pool.map(self._fetch_year, years_to_process)):
+                for item in items:
+                    raw_items_map[f"{year}:{item['source_uuid']}"] = item
 
-            self.logger.info(f"Done fetching year {year}. Unique items so far: {len(raw_items_map)}")
+                self.logger.info(f"Done fetching year {year}. Unique items so far: {len(raw_items_map)}")
 
         all_unique_items = list(raw_items_map.values())
 
-        series_map = self._sync_series(db_session, all_unique_items)
-        quirk_map = self._sync_quirks(db_session, all_unique_items)
-        location_map = self._sync_locations(db_session, all_unique_items)
+        series_names, unique_quirks, location_names, card_quirk_rows, card_location_rows = self._collect(
+            all_unique_items
+        )
+
+        self._sync_series(db_session, series_names)
+        self._sync_quirks(db_session, unique_quirks)
+        self._sync_locations(db_session, location_names)
 
         self.logger.info("Done syncing data for card relations")
 
-        card_adapter = CardAdapter(series_map, quirk_map, location_map)
+        card_adapter = CardAdapter(series_names)
         cards_to_process = card_adapter.run(all_unique_items)
 
         self._upsert_cards(db_session, cards_to_process, chunk_size=5000)
+        synced_card_ids = [card.id for card in cards_to_process]
+        self._sync_associations(db_session, card_quirk_association, synced_card_ids, card_quirk_rows, "quirk_name")
+        self._sync_associations(
+            db_session, card_location_association, synced_card_ids, card_location_rows, "location_name"
+        )
 
         self.logger.info("Sync Complete.")
 
     def _upsert_cards(self, session, cards: List[Card], chunk_size: int = 5000) -> None:
         mapper = sa_inspect(Card).mapper
         col_names = [c.key for c in mapper.column_attrs]
-        cols = Card.__table__.columns
+        get_values = attrgetter(*col_names)
+        card_table = Card.__table__
 
-        update_cols = {c.name: insert(Card).excluded[c.name] for c in cols if c.name != "id"}
+        base = insert(card_table)
+        update_cols = {c.name: base.excluded[c.name] for c in card_table.columns if c.name != "id"}
+        # Built once and executed with a list of rows, so every chunk reuses the same cached compiled
+        # statement and psycopg2 batches it via insertmanyvalues instead of a fresh .values(rows) per chunk
+        stmt = base.on_conflict_do_update(index_elements=["id"], set_=update_cols)
 
         total = len(cards)
         for start in range(0, total, chunk_size):
             chunk = cards[start : start + chunk_size]
-            rows = [{k: getattr(obj, k) for k in col_names} for obj in chunk]
+            rows = [dict(zip(col_names, get_values(obj))) for obj in chunk]
 
             session.execute(text("SET LOCAL synchronous_commit TO OFF"))
-
-            stmt = insert(Card).values(rows).on_conflict_do_update(
-                index_elements=["id"],
-                set_=update_cols,
-            )
-            session.execute(stmt)
+            session.execute(stmt, rows)
             session.commit()
 
             self.logger.info(f"Upserted cards: {min(start + chunk_size, total)}/{total}")
 
-    def _sync_series(self, session, raw_data) -> Dict[str, Series]:
-        unique_series = {}
-        for item in raw_data:
-            s_name = item.get("series", "")
-            if s_name:
-                unique_series[s_name] = {"name": s_name}
+    def _sync_associations(
+        self, session, table, card_ids: List[str], rows: List[Dict[str, str]], name_col: str, chunk_size: int = 10000
+    ) -> None:
+        """Replaces the association rows of the synced cards with the fresh set.
+
+        Links of these cards that are no longer in rows are deleted in one statement (fresh pairs passed as two
+        arrays), then the fresh rows are inserted, leaving pairs that already exist untouched.
+        """
+        if not card_ids:
+            return
+
+        deleted = session.execute(
+            text(
+                f"DELETE FROM {table.name} AS t "
+                f"WHERE t.card_id = ANY(:card_ids) "
+                f"AND NOT EXISTS ("
+                f"SELECT 1 FROM unnest(CAST(:fresh_ids AS text[]), CAST(:fresh_names AS text[])) AS f(card_id, name) "
+                f"WHERE f.card_id = t.card_id AND f.name = t.{name_col})"
+            ),
+            {
+                "card_ids": card_ids,
+                "fresh_ids": [r["card_id"] for r in rows],
+                "fresh_names": [r[name_col] for r in rows],
+            },
+        ).rowcount
+
+        total = len(rows)
+        for start in range(0, total, chunk_size):
+            chunk = rows[start : start + chunk_size]
+            stmt = insert(table).values(chunk).on_conflict_do_nothing(index_elements=["card_id", name_col])
+            session.execute(stmt)
 
-        for data in unique_series.values():
-            session.merge(Series(**data))
+        # One commit for the delete and the inserts, so readers never see a card with its links half replaced
+        session.commit()
 
-        session.flush()
+        self.logger.info(f"Synced {table.name}: {total} rows, {deleted} stale removed")
+
+    def _collect(
+        self, raw_data
+    ) -> Tuple[Set[str], Dict[str, Dict[str, str]], Set[str], List[Dict[str, str]], List[Dict[str, str]]]:
+        """Single pass over the raw items collecting relation names and card association rows."""
+        series_names: Set[str] = set()
+        unique_quirks: Dict[str, Dict[str, str]] = {}
+        location_names: Set[str] = set()
+        card_quirk_rows: List[Dict[str, str]] = []
+        card_location_rows: List[Dict[str, str]] = []
 
-        results = session.execute(select(Series)).scalars().all()
-        final_map = {}
-        for s in results:
-            session.expunge(s)
-            final_map[s.name] = s
-        return final_map
+        add_series = series_names.add
+        add_location = location_names.add
+        append_quirk_row = card_quirk_rows.append
+        append_location_row = card_location_rows.append
 
-    def _sync_quirks(self, session, raw_data) -> Dict[str, Quirk]:
-        unique_quirks = {}
         for item in raw_data:
-            for q in item.get("quirks", []) or []:
+            card_id = f"{item['year']}:{item['source_uuid']}"
+            get = item.get
+
+            s_name = get("series")
+            if s_name:
+                add_series(s_name)
+
+            for q in get("quirks") or _EMPTY:
                 name = q.get("name")
-                if name and name not in unique_quirks:
+                if not name:
+                    continue
+                if name not in unique_quirks:
                     unique_quirks[name] = {
                         "name": name,
                         "description": q.get("description", ""),
                         "img": q.get("img", ""),
                     }
+                append_quirk_row({"card_id": card_id, "quirk_name": name})
+
+            for l in get("locations") or _EMPTY:
+                if l:
+                    add_location(l)
+                    append_location_row({"card_id": card_id, "location_name": l})
+
+        return series_names, unique_quirks, location_names, card_quirk_rows, card_location_rows
 
-        for q_data in unique_quirks.values():
-            session.merge(Quirk(**q_data))
+    def _sync_series(self, session, series_names: Set[str]) -> None:
+        with session.no_autoflush:
+            for s_name in series_names:
+                session.merge(Series(name=s_name))
 
         session.flush()
 
-        results = session.execute(select(Quirk)).scalars().all()
-        final_map = {}
-        for q in results:
-            session.expunge(q)
-            final_map[q.name] = q
-        return final_map
+    def _sync_quirks(self, session, unique_quirks: Dict[str, Dict[str, str]]) -> None:
+        with session.no_autoflush:
+            for q_data in unique_quirks.values():
+                session.merge(Quirk(**q_data))
 
-    def _sync_locations(self, session, raw_data) -> Dict[str, Location]:
-        unique_locs = set()
-        for item in raw_data:
-            for l in item.get("locations", []) or []:
-                if l:
-                    unique_locs.add(l)
+        session.flush()
 
-        for loc_name in unique_locs:
-            session.merge(Location(name=loc_name))
+    def _sync_locations(self, session, location_names: Set[str]) -> None:
+        with session.no_autoflush:
+            for loc_name in location_names:
+                session.merge(Location(name=loc_name))
 
         session.flush()
 
-        results = session.execute(select(Location)).scalars().all()
-        final_map = {}
-        for l in results:
-            session.expunge(l)
-            final_map[l.name] = l
-        return final_map
+    def _fetch_year(self, year: int) -> List[Dict[str, Any]]:
+        self.logger.info(f"Fetching data for year {year}")
+        url = f"https://mlb{year}.theshow.com/apis/items.json"
 
-    def fetch_paginated_data(self, url: str, params: Dict) -> List:
-        page = 1
-        params["page"] = page
-        res = self.api_client.get(url, params)
+        items = []
+        for item in self.fetch_paginated_data(url, {"type": "mlb_card"}):
+            source_uuid = item.get("uuid")
+            if not source_uuid:
+                continue
 
-        max_pages = self._json_get(res, "total_pages", default=0)
-        fetched_objects = []
+            item["year"] = year
+            item["source_uuid"] = source_uuid
+            items.append(item)
+
+        return items
 
-        while page <= max_pages:
-            self.logger.info(f"fetching page {page} of {max_pages}")
-            items = self._json_get(res, "items", default=[])
-            fetched_objects.extend(items)
+    def fetch_paginated_data(self, url: str, params: Dict) -> Iterator[Dict[str, Any]]:
+        res = self.api_client.get(url, {**params, "page": 1})
+        max_pages = self._json_get(res, "total_pages", default=0)
+        if max_pages < 1:
+            return
 
-            page += 1
-            if page > max_pages:
-                break
+        self.logger.info(f"fetching page 1 of {max_pages}")
+        yield from self._json_get(res, "items", default=[]) or []
 
-            params["page"] = page
-            res = self.api_client.get(url, params)
+        if max_pages == 1:
+            return
 
-        return fetched_objects
+        # Page 1 tells us how many pages exist; the rest can be fetched concurrently and yielded in order
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as pool:
+            pages = pool.map(lambda p: self.api_client.get(url, {**params, "page": p}), range(2, max_pages + 1))
+            for page, res in enumerate(pages, start=2):
+                self.logger.info(f"fetching page {page} of {max_pages}")
+                yield from self._json_get(res, "items", default=[]) or []
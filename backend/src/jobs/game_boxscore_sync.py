@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import datetime
-import random
-import time
+import io
+from array import array
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import exists, select
+import numpy as np
+
+from sqlalchemy import bindparam, literal_column, select
 from sqlalchemy.dialects.postgresql import insert
 
 from src.core.batting_aggregator import MLBPlayByPlayBattingAggregator
 from src.core.baserunning_aggregator import MLBPlayByPlayBaserunningAggregator
 from src.core.pitching_aggregator import MLBPlayByPlayPitchingAggregator
-from src.core.http_client import APIClient
+from src.core.pbp_aggregator import build_all_rows
+from src.core.rate_limiter import RateLimiter
+from src.database.bulk import CopyUpsertBuffer
 from src.database.models import (
     BirthLocation,
     MLBGame,
@@ -29,9 +34,93 @@ from src.jobs.base import BaseJob
 
 
 MAX_WORKERS = 6
-JITTER_RANGE_S = (0.05, 0.25)
+# Shared StatsAPI request budget across all workers
+REQUESTS_PER_SECOND = 10
+PEOPLE_CHUNK_SIZE = 100
+PLAYER_UPSERT_BATCH = 500
+
+IGNORED_GAME_TYPES = frozenset(("S", "A", "I", "E"))
+_NOT_IGNORED = MLBGame.game_type.not_in(IGNORED_GAME_TYPES)
+
+# Boxscore fielding keys and the matching mlb_game_fielding_stats columns; chances must stay last
+FIELDING_STAT_KEYS = (
+    "assists", "putOuts", "errors", "passedBall", "pickoffs", "stolenBases", "caughtStealing", "chances"
+)
+FIELDING_STAT_COLS = (
+    "assists", "put_outs", "errors", "passed_balls", "pickoffs", "stolen_bases_allowed", "caught_stealing", "chances"
+)
 
-IGNORED_GAME_TYPES = {"S", "A", "I", "E"}
+# StatsAPI trims the boxscore server-side to these keys, so we only download and decode what the worker reads
+BOXSCORE_FIELDS_PARAMS = {
+    "fields": ",".join(
+        ("teams", "home", "away", "team", "id", "players", "person", "stats", "fielding") + FIELDING_STAT_KEYS
+    )
+}
+
+
+def _boxscore_has_players(res: Dict[str, Any]) -> bool:
+    teams = res.get("teams") or {}
+    return any((teams.get(side) or {}).get("players") for side in ("home", "away"))
+
+
+# ON CONFLICT statements are built once at import; callers only bind row values
+_TEAM_INSERT = insert(MLBTeam)
+_TEAM_UPDATE_COLS = {c.name: _TEAM_INSERT.excluded[c.name] for c in MLBTeam.__table__.columns if c.name != "id"}
+
+_POSITION_INSERT = insert(MLBPosition)
+_POSITION_UPSERT = _POSITION_INSERT.on_conflict_do_update(
+    index_elements=["id"],
+    set_={
+        "name": _POSITION_INSERT.excluded["name"],
+        "abbreviation": _POSITION_INSERT.excluded["abbreviation"],
+    },
+)
+
+_PLAYER_INSERT = insert(Player)
+_PLAYER_UPSERT = _PLAYER_INSERT.on_conflict_do_update(
+    index_elements=["mlb_id"],
+    set_={c.name: _PLAYER_INSERT.excluded[c.name] for c in Player.__table__.columns if c.name != "mlb_id"},
+)
+
+
+_BIRTH_LOC_SELECT = select(BirthLocation.id).where(
+    BirthLocation.city == bindparam("city"),
+    BirthLocation.country == bindparam("country"),
+    BirthLocation.state_province.is_not_distinct_from(bindparam("state_province")),
+)
+
+# Birth location ids read back from the table outlive a single job run in this process. Ids inserted by
+# the current run stay in the instance cache, since its transaction may still roll back.
+_KNOWN_BIRTH_LOC_IDS: Dict[Tuple[str, Optional[str], str], int] = {}
+
+
+# Schedules repeat the same few start times and people payloads repeat birth/debut dates,
+# so the parsers are memoized on the raw string
+@lru_cache(maxsize=65536)
+def _parse_dt_utc_naive(s: Any) -> Optional[datetime.datetime]:
+    if not s:
+        return None
+    try:
+        txt = str(s).strip()
+        if txt.endswith("Z"):
+            # StatsAPI's usual form; already UTC, so drop the suffix and skip the tz round trip
+            return datetime.datetime.fromisoformat(txt[:-1])
+        dt = datetime.datetime.fromisoformat(txt)
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return dt
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(s: Any) -> Optional[datetime.date]:
+    if not s:
+        return None
+    try:
+        return datetime.date.fromisoformat(str(s).strip())
+    except Exception:
+        return None
 
 
 class GameBoxscoreSync(BaseJob):
@@ -59,10 +148,32 @@ class GameBoxscoreSync(BaseJob):
         self.batting_chunk_size = batting_chunk_size
         self.rerun_all_boxscores = rerun_all_boxscores
 
+        # Dropped for the rest of the run if the trimmed payload turns out to lose the players map
+        self._boxscore_params: Optional[Dict[str, str]] = BOXSCORE_FIELDS_PARAMS
         self._birth_loc_cache: Dict[Tuple[str, Optional[str], str], int] = {}
         self._player_exists_cache: Set[int] = set()
+        self._player_exists_arr: np.ndarray = np.array([], dtype=np.int64)
+        self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        self._rate_limiter = RateLimiter(REQUESTS_PER_SECOND, burst=MAX_WORKERS)
+
+        # COPY sinks keep their prepared staging/merge SQL across batches
+        self._game_sink = CopyUpsertBuffer(MLBGame.__table__, ["id"])
+        self._boxscore_sink = CopyUpsertBuffer(MLBGameBoxscore.__table__, ["game_id", "player_id"], ["team_id"])
+        self._fielding_sink = CopyUpsertBuffer(MLBGameFieldingStats.__table__, ["game_id", "player_id"])
+        self._batting_sink = CopyUpsertBuffer(MLBGameBattingStats.__table__, ["game_id", "player_id", "split"])
+        self._baserunning_sink = CopyUpsertBuffer(
+            MLBGameBaserunningStats.__table__, ["game_id", "player_id"], ["sb", "caught_stealing"]
+        )
+        self._pitching_sink = CopyUpsertBuffer(MLBGamePitchingStats.__table__, ["game_id", "player_id", "split"])
+        self._pbp_sinks = (self._batting_sink, self._baserunning_sink, self._pitching_sink)
 
     def execute(self, db_session):
+        try:
+            self._sync(db_session)
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def _sync(self, db_session):
         season_year, start_date, end_date = self._season_window()
         self.logger.info(
             f"Starting GameBoxscoreSync... season_year={season_year} start={start_date} end={end_date} "
@@ -83,6 +194,7 @@ class GameBoxscoreSync(BaseJob):
         db_session.commit()
         teams_in_db = set(db_session.execute(select(MLBTeam.id)).scalars().all())
 
+        parse_dt = _parse_dt_utc_naive
         game_rows: List[Dict[str, Any]] = []
         for g in games:
             game_pk = g.get("gamePk")
@@ -100,7 +212,7 @@ class GameBoxscoreSync(BaseJob):
                 continue
 
             season = int(g.get("season") or season_year)
-            game_date = self._parse_dt_utc_naive(g.get("gameDate"))
+            game_date = parse_dt(g.get("gameDate"))
             status = g.get("status") or {}
             status_code = (status.get("statusCode") or "").strip()
 
@@ -142,36 +254,40 @@ class GameBoxscoreSync(BaseJob):
             batch_game_ids = target_game_ids[i : i + BOXSCORE_BATCH_SIZE]
             self.logger.info(f"Processing Boxscore batch {i} to {i+len(batch_game_ids)} of {total_boxscore_games}")
 
-            boxscore_rows_buffer: List[Dict[str, Any]] = []
+            # Boxscore rows are kept column-wise so the player filter is a single vectorized lookup
+            box_game_ids = array("q")
+            box_player_ids = array("q")
+            box_team_ids = array("q")
             fielding_rows_buffer: List[Dict[str, Any]] = []
             batch_player_ids: Set[int] = set()
 
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-                futures = {pool.submit(self._fetch_boxscore_worker, gid): gid for gid in batch_game_ids}
-                for fut in as_completed(futures):
-                    gid = futures[fut]
-                    try:
-                        rows_for_game, f_rows_for_game, player_ids_for_game = fut.result()
-                    except Exception as e:
-                        failed_games += 1
-                        self.logger.info(f"[BOXSCORE_FAILED] game_id={gid} err='{e}'")
-                        continue
-
-                    if not rows_for_game:
-                        self.logger.info(f"[BOXSCORE_EMPTY] game_id={gid}")
-                    if not player_ids_for_game:
-                        self.logger.info(f"[BOXSCORE_NO_PLAYERS] game_id={gid} rows={len(rows_for_game)}")
-                    
-                    if rows_for_game:
-                        boxscore_rows_buffer.extend(rows_for_game)
-
-                    if f_rows_for_game:
-                        fielding_rows_buffer.extend(f_rows_for_game)
-
-                    if player_ids_for_game:
-                        batch_player_ids |= player_ids_for_game
-                        # Persist for PBP phase
-                        per_game_player_ids[int(gid)] = set(player_ids_for_game)
+            futures = {self._pool.submit(self._fetch_boxscore_worker, gid): gid for gid in batch_game_ids}
+            for fut in as_completed(futures):
+                gid = futures[fut]
+                try:
+                    (pids_for_game, tids_for_game), f_rows_for_game, player_ids_for_game = fut.result()
+                except Exception as e:
+                    failed_games += 1
+                    self.logger.info(f"[BOXSCORE_FAILED] game_id={gid} err='{e}'")
+                    continue
+
+                if not pids_for_game:
+                    self.logger.info(f"[BOXSCORE_EMPTY] game_id={gid}")
+                if not player_ids_for_game:
+                    self.logger.info(f"[BOXSCORE_NO_PLAYERS] game_id={gid} rows={len(pids_for_game)}")
+
+                if pids_for_game:
+                    box_game_ids.extend([int(gid)] * len(pids_for_game))
+                    box_player_ids.extend(pids_for_game)
+                    box_team_ids.extend(tids_for_game)
+
+                if f_rows_for_game:
+                    fielding_rows_buffer.extend(f_rows_for_game)
+
+                if player_ids_for_game:
+                    batch_player_ids |= player_ids_for_game
+                    # Persist for PBP phase
+                    per_game_player_ids[int(gid)] = set(player_ids_for_game)
 
             # Sync Players found in this batch
             if batch_player_ids:
@@ -180,27 +296,30 @@ class GameBoxscoreSync(BaseJob):
                     self.logger.info(f"Missing players to upsert in batch={len(missing)}")
                     people = self._fetch_people_bulk(missing)
                     created_p, updated_p, failed_p = self._upsert_people_from_people_payload(db_session, people)
-                    db_session.commit()
+                    self._refresh_player_exists_arr()
 
             # Filter Boxscore Rows (ensure player exists)
-            filtered_boxscore_rows: List[Dict[str, Any]] = []
-            skipped_missing_player = 0
-            for r in boxscore_rows_buffer:
-                pid = int(r["player_id"])
-                if pid not in self._player_exists_cache:
-                    skipped_missing_player += 1
-                    continue
-                filtered_boxscore_rows.append(r)
+            player_arr = np.frombuffer(box_player_ids, dtype=np.int64)
+            keep = self._players_exist(player_arr)
+            skipped_missing_player = int(player_arr.size - np.count_nonzero(keep))
+            filtered_boxscore_rows = [
+                {"game_id": g, "player_id": p, "team_id": t}
+                for g, p, t in zip(
+                    np.frombuffer(box_game_ids, dtype=np.int64)[keep].tolist(),
+                    player_arr[keep].tolist(),
+                    np.frombuffer(box_team_ids, dtype=np.int64)[keep].tolist(),
+                )
+            ]
 
             # Upsert Boxscores
             if filtered_boxscore_rows:
                 created, updated = self._upsert_game_boxscores(db_session, filtered_boxscore_rows)
             
             # Filter and Upsert Fielding Rows
-            filtered_fielding_rows: List[Dict[str, Any]] = []
-            for r in fielding_rows_buffer:
-                if int(r["player_id"]) in self._player_exists_cache:
-                    filtered_fielding_rows.append(r)
+            fielding_keep = self._players_exist(
+                np.fromiter((r["player_id"] for r in fielding_rows_buffer), dtype=np.int64, count=len(fielding_rows_buffer))
+            )
+            filtered_fielding_rows = [r for r, ok in zip(fielding_rows_buffer, fielding_keep.tolist()) if ok]
 
             if filtered_fielding_rows:
                 self._upsert_fielding_stats(db_session, filtered_fielding_rows)
@@ -213,13 +332,7 @@ class GameBoxscoreSync(BaseJob):
         )
 
         missing_boxscore_games = list(
-            db_session.execute(
-                select(MLBGame.id).where(
-                    MLBGame.season == season_year,
-                    ~MLBGame.game_type.in_(IGNORED_GAME_TYPES),
-                    ~exists(select(1).where(MLBGameBoxscore.game_id == MLBGame.id)),
-                ).limit(50)
-            ).scalars().all()
+            db_session.execute(self._games_without_boxscores(season_year).limit(50)).scalars().all()
         )
         if missing_boxscore_games:
             self.logger.info(f"[BOXSCORE_MISSING_IN_DB] sample_game_ids={missing_boxscore_games}")
@@ -230,9 +343,9 @@ class GameBoxscoreSync(BaseJob):
         baserunning_agg = MLBPlayByPlayBaserunningAggregator()
         pitching_agg = MLBPlayByPlayPitchingAggregator()
 
-        batting_rows_buffer: List[Dict[str, Any]] = []
-        baserunning_rows_buffer: List[Dict[str, Any]] = []
-        pitching_rows_buffer: List[Dict[str, Any]] = []
+        # Rows are reduced to value tuples as they are produced; no intermediate dict lists per batch.
+        # Order matches build_all_rows' (batting, baserunning, pitching) result.
+        pbp_sinks = self._pbp_sinks
 
         failed_pbp = 0
         games_with_pbp = 0
@@ -245,57 +358,44 @@ class GameBoxscoreSync(BaseJob):
             batch_ids = all_game_ids[i : i + GAME_BATCH_SIZE]
             self.logger.info(f"Processing PBP batch {i} to {i+len(batch_ids)} of {total_games}")
             
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-                futures = {pool.submit(self._fetch_playbyplay_worker, gid): gid for gid in batch_ids}
-                
-                for fut in as_completed(futures):
-                    gid = futures[fut]
-                    try:
-                        payload = fut.result()
-                    except Exception as e:
-                        failed_pbp += 1
-                        self.logger.info(f"[PBP_FAILED] game_id={gid} err='{e}'")
-                        continue
-
-                    if not payload:
-                        continue
-
-                    allowed = per_game_player_ids.get(int(gid)) or set()
-                    if not allowed:
-                        self.logger.info(f"[PBP_NO_ALLOWED] game_id={gid}")
-                        continue
-
-                    b_rows = batting_agg.build_rows(int(gid), payload) or []
-                    kept_b = [r for r in b_rows if int(r["player_id"]) in allowed and int(r["player_id"]) in self._player_exists_cache]
-                    batting_rows_buffer.extend(kept_b)
-
-                    br_rows = baserunning_agg.build_rows(int(gid), payload) or []
-                    kept_br = [r for r in br_rows if int(r["player_id"]) in allowed and int(r["player_id"]) in self._player_exists_cache]
-                    baserunning_rows_buffer.extend(kept_br)
-
-                    p_rows = pitching_agg.build_rows(int(gid), payload) or []
-                    kept_p = [r for r in p_rows if int(r["player_id"]) in allowed and int(r["player_id"]) in self._player_exists_cache]
-                    pitching_rows_buffer.extend(kept_p)
-
-                    games_with_pbp += 1
+            futures = {self._pool.submit(self._fetch_playbyplay_worker, gid): gid for gid in batch_ids}
+            exists_cache = self._player_exists_cache
 
+            for fut in as_completed(futures):
+                gid = futures[fut]
+                try:
+                    payload = fut.result()
+                except Exception as e:
+                    failed_pbp += 1
+                    self.logger.info(f"[PBP_FAILED] game_id={gid} err='{e}'")
+                    continue
+
+                if not payload:
+                    continue
+
+                allowed = per_game_player_ids.get(int(gid)) or set()
+                if not allowed:
+                    self.logger.info(f"[PBP_NO_ALLOWED] game_id={gid}")
+                    continue
+
+                # Aggregators already emit int player_ids; intersect once so each row is a single lookup
+                keep_ids = allowed & exists_cache
+
+                all_rows = build_all_rows(int(gid), payload, batting_agg, baserunning_agg, pitching_agg)
+                for sink, rows in zip(pbp_sinks, all_rows):
+                    sink.extend(r for r in rows if r["player_id"] in keep_ids)
+
+                games_with_pbp += 1
+
+            batting_sink, baserunning_sink, pitching_sink = pbp_sinks
             self.logger.info(
-                f"[PBP_BATCH_FLUSH] batting={len(batting_rows_buffer)} baserun={len(baserunning_rows_buffer)} "
-                f"pitching={len(pitching_rows_buffer)}"
+                f"[PBP_BATCH_FLUSH] batting={len(batting_sink)} baserun={len(baserunning_sink)} "
+                f"pitching={len(pitching_sink)}"
             )
 
-            if batting_rows_buffer:
-                self._upsert_batting_stats(db_session, batting_rows_buffer)
-                batting_rows_buffer.clear()
-            
-            if baserunning_rows_buffer:
-                self._upsert_baserunning_stats(db_session, baserunning_rows_buffer)
-                baserunning_rows_buffer.clear()
-                
-            if pitching_rows_buffer:
-                self._upsert_pitching_stats(db_session, pitching_rows_buffer)
-                pitching_rows_buffer.clear()
-                
+            for sink in pbp_sinks:
+                sink.flush(db_session)
+
             db_session.commit()
             self.logger.info(f"Batch {i} committed.")
         self.logger.info(
@@ -322,30 +422,32 @@ class GameBoxscoreSync(BaseJob):
         return self.api_client.get(url, params) or {}
 
     def _collect_games(self, dates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # StatsAPI gameType/gamePk are already clean str/int; coercion happens when rows are built
+        ignored = IGNORED_GAME_TYPES
         by_pk: Dict[int, Dict[str, Any]] = {}
         for d in dates:
-            for g in (d.get("games") or []):
-                game_type = (g.get("gameType") or "").strip()
-                if game_type in IGNORED_GAME_TYPES:
+            games = d.get("games")
+            if not games:
+                continue
+            for g in games:
+                if g.get("gameType") in ignored:
                     continue
                 game_pk = g.get("gamePk")
                 if game_pk is None:
                     continue
-                try:
-                    pk_int = int(game_pk)
-                except Exception:
-                    continue
-                by_pk[pk_int] = g
+                by_pk[game_pk] = g
         return list(by_pk.values())
 
     def _collect_team_ids(self, games: List[Dict[str, Any]]) -> Set[int]:
         team_ids: Set[int] = set()
+        add = team_ids.add
+        extract = self._extract_home_away_ids
         for g in games:
-            away_id, home_id = self._extract_home_away_ids(g)
+            away_id, home_id = extract(g)
             if away_id is not None:
-                team_ids.add(int(away_id))
+                add(away_id)
             if home_id is not None:
-                team_ids.add(int(home_id))
+                add(home_id)
         return team_ids
 
     def _extract_home_away_ids(self, game: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
@@ -363,54 +465,52 @@ class GameBoxscoreSync(BaseJob):
         if not team_ids:
             return
 
-        existing_ids = set(db_session.execute(select(MLBTeam.id)).scalars().all())
-
         results: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]] = []
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-            futures = {pool.submit(self._fetch_team_worker, tid, season_year): tid for tid in sorted(team_ids)}
-            for fut in as_completed(futures):
-                tid = futures[fut]
-                try:
-                    team_obj = fut.result()
-                    results.append((tid, team_obj, None))
-                except Exception as e:
-                    results.append((tid, None, str(e)))
+        futures = {self._pool.submit(self._fetch_team_worker, tid, season_year): tid for tid in team_ids}
+        for fut in as_completed(futures):
+            tid = futures[fut]
+            try:
+                team_obj = fut.result()
+                results.append((tid, team_obj, None))
+            except Exception as e:
+                results.append((tid, None, str(e)))
 
-        created = 0
-        updated = 0
         failed = 0
-
+        rows: List[Dict[str, Any]] = []
         for tid, team_obj, err in results:
             if err or not team_obj:
                 failed += 1
                 self.logger.info(f"[TEAM_FETCH_FAILED] team_id={tid} err='{err}'")
                 continue
 
-            team = MLBTeam(
-                id=int(team_obj["id"]),
-                name=str(team_obj.get("name") or ""),
-                abbreviation=str(team_obj.get("abbreviation") or ""),
-                location_name=str(team_obj.get("locationName") or ""),
-                team_name=str(team_obj.get("teamName") or ""),
-                active=bool(team_obj.get("active") or False),
+            rows.append(
+                {
+                    "id": int(team_obj["id"]),
+                    "name": str(team_obj.get("name") or ""),
+                    "abbreviation": str(team_obj.get("abbreviation") or ""),
+                    "location_name": str(team_obj.get("locationName") or ""),
+                    "team_name": str(team_obj.get("teamName") or ""),
+                    "active": bool(team_obj.get("active") or False),
+                }
             )
-            db_session.merge(team)
 
-            if tid in existing_ids:
-                updated += 1
-            else:
-                created += 1
-                existing_ids.add(tid)
+        created = 0
+        if rows:
+            stmt = (
+                _TEAM_INSERT.values(rows)
+                .on_conflict_do_update(index_elements=["id"], set_=_TEAM_UPDATE_COLS)
+                # xmax is 0 only for freshly inserted tuples
+                .returning(literal_column("xmax = 0"))
+            )
+            created = sum(1 for (inserted,) in db_session.execute(stmt) if inserted)
 
-        db_session.flush()
-        self.logger.info(f"Teams upserted. created={created} updated={updated} failed={failed}")
+        self.logger.info(f"Teams upserted. created={created} updated={len(rows) - created} failed={failed}")
 
     def _fetch_team_worker(self, team_id: int, season_year: int) -> Dict[str, Any]:
-        time.sleep(random.uniform(*JITTER_RANGE_S))
-        client = APIClient()
+        self._rate_limiter.acquire()
         url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}"
         params = {"season": season_year}
-        res = client.get(url, params) or {}
+        res = self.api_client.get(url, params) or {}
         teams = res.get("teams") or []
         if not teams:
             raise RuntimeError("empty teams response")
@@ -420,38 +520,58 @@ class GameBoxscoreSync(BaseJob):
         if not rows:
             return
 
-        cols = MLBGame.__table__.columns
-        update_cols = {c.name: insert(MLBGame).excluded[c.name] for c in cols if c.name != "id"}
-
         total = len(rows)
         for start in range(0, total, chunk_size):
-            chunk = rows[start : start + chunk_size]
-            stmt = (
-                insert(MLBGame)
-                .values(chunk)
-                .on_conflict_do_update(index_elements=["id"], set_=update_cols)
-            )
-            db_session.execute(stmt)
-            db_session.flush()
+            self._game_sink.extend(rows[start : start + chunk_size])
+            self._game_sink.flush(db_session)
 
     def _target_game_ids_for_boxscores(self, db_session, season_year: int) -> List[int]:
-        base = select(MLBGame.id).where(
-            MLBGame.season == season_year,
-            ~MLBGame.game_type.in_(IGNORED_GAME_TYPES),
-        )
-
         if self.rerun_all_boxscores:
-            return list(db_session.execute(base).scalars().all())
+            stmt = select(MLBGame.id).where(
+                MLBGame.season == season_year,
+                _NOT_IGNORED,
+            )
+            return list(db_session.execute(stmt).scalars().all())
 
-        subq = select(MLBGameBoxscore.game_id).where(MLBGameBoxscore.game_id == MLBGame.id).limit(1)
-        stmt = base.where(~exists(subq))
-        return list(db_session.execute(stmt).scalars().all())
+        return list(db_session.execute(self._games_without_boxscores(season_year)).scalars().all())
 
-    def _fetch_boxscore_worker(self, game_id: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Set[int]]:
-        time.sleep(random.uniform(*JITTER_RANGE_S))
-        client = APIClient()
+    def _games_without_boxscores(self, season_year: int):
+        # Explicit LEFT JOIN ... IS NULL anti-join rather than a correlated NOT EXISTS
+        return (
+            select(MLBGame.id)
+            .outerjoin(MLBGameBoxscore, MLBGameBoxscore.game_id == MLBGame.id)
+            .where(
+                MLBGame.season == season_year,
+                _NOT_IGNORED,
+                MLBGameBoxscore.game_id.is_(None),
+            )
+        )
+
+    def _fetch_boxscore(self, game_id: int) -> Dict[str, Any]:
         url = f"https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
-        res = client.get(url, params=None) or {}
+        params = self._boxscore_params
+
+        self._rate_limiter.acquire()
+        res = self.api_client.get(url, params=params) or {}
+        if params is None or _boxscore_has_players(res):
+            return res
+
+        # A trimmed boxscore without players is either a game with no box yet or the fields filter dropping
+        # the ID<personId>-keyed players map; the full payload tells which
+        self._rate_limiter.acquire()
+        full = self.api_client.get(url) or {}
+        if _boxscore_has_players(full):
+            self.logger.warning(
+                f"[BOXSCORE_FIELDS_FALLBACK] game_id={int(game_id)} trimmed boxscore had no players; "
+                f"fetching full boxscores for the rest of the run"
+            )
+            self._boxscore_params = None
+        return full
+
+    def _fetch_boxscore_worker(
+        self, game_id: int
+    ) -> Tuple[Tuple[List[int], List[int]], List[Dict[str, Any]], Set[int]]:
+        res = self._fetch_boxscore(game_id)
         teams = res.get("teams") or {}
 
         player_ids: Set[int] = set()
@@ -459,8 +579,9 @@ class GameBoxscoreSync(BaseJob):
         # Ensure unique (game_id, player_id) for boxscores
         boxscore_team_by_pid: Dict[int, int] = {}
 
-        # Ensure unique (game_id, player_id) for fielding rows
-        fielding_by_pid: Dict[int, Dict[str, Any]] = {}
+        # Raw fielding stats per player appearance; reduced (and deduped per pid) in one numpy pass below
+        fielding_pids: List[int] = []
+        fielding_raw: List[List[Any]] = []
 
         def process_side(side: str) -> None:
             t = teams.get(side) or {}
@@ -491,200 +612,123 @@ class GameBoxscoreSync(BaseJob):
                     boxscore_team_by_pid[pid] = prev_team
 
                 stats = pdata.get("stats") or {}
-                f_stats = stats.get("fielding") or {}
-
-                assists = self._safe_int(f_stats.get("assists")) or 0
-                put_outs = self._safe_int(f_stats.get("putOuts")) or 0
-                errors = self._safe_int(f_stats.get("errors")) or 0
-                passed_balls = self._safe_int(f_stats.get("passedBall")) or 0
-                pickoffs = self._safe_int(f_stats.get("pickoffs")) or 0
+                f_stats = stats.get("fielding")
+                if f_stats:
+                    fielding_pids.append(pid)
+                    fielding_raw.append([f_stats.get(k) or 0 for k in FIELDING_STAT_KEYS])
 
-                sb_allowed = self._safe_int(f_stats.get("stolenBases")) or 0
-                cs_allowed = self._safe_int(f_stats.get("caughtStealing")) or 0
-
-                chances = self._safe_int(f_stats.get("chances")) or (assists + put_outs + errors)
-
-                has_fielding_stat = (
-                    (chances > 0)
-                    or (passed_balls > 0)
-                    or (pickoffs > 0)
-                    or (sb_allowed > 0)
-                    or (cs_allowed > 0)
-                )
+        process_side("home")
+        process_side("away")
 
-                if not has_fielding_stat:
-                    continue
+        boxscore_cols = (list(boxscore_team_by_pid.keys()), list(boxscore_team_by_pid.values()))
+        fielding_rows = self._reduce_fielding(int(game_id), fielding_pids, fielding_raw)
 
-                existing = fielding_by_pid.get(pid)
-                if existing is None:
-                    fielding_by_pid[pid] = {
-                        "game_id": int(game_id),
-                        "player_id": pid,
-                        "assists": assists,
-                        "put_outs": put_outs,
-                        "errors": errors,
-                        "chances": chances,
-                        "passed_balls": passed_balls,
-                        "pickoffs": pickoffs,
-                        "stolen_bases_allowed": sb_allowed,
-                        "caught_stealing": cs_allowed,
-                    }
-                else:
-                    existing["assists"] += assists
-                    existing["put_outs"] += put_outs
-                    existing["errors"] += errors
-                    existing["chances"] += chances
-                    existing["passed_balls"] += passed_balls
-                    existing["pickoffs"] += pickoffs
-                    existing["stolen_bases_allowed"] += sb_allowed
-                    existing["caught_stealing"] += cs_allowed
+        return boxscore_cols, fielding_rows, player_ids
 
-        process_side("home")
-        process_side("away")
+    def _reduce_fielding(
+        self, game_id: int, pids: List[int], raw: List[List[Any]]
+    ) -> List[Dict[str, Any]]:
+        if not pids:
+            return []
 
-        boxscore_rows: List[Dict[str, Any]] = [
-            {"game_id": int(game_id), "player_id": pid, "team_id": tid}
-            for pid, tid in boxscore_team_by_pid.items()
+        try:
+            stats = np.array(raw, dtype=np.int64)
+        except (TypeError, ValueError):
+            stats = np.array([[self._safe_int(v) or 0 for v in r] for r in raw], dtype=np.int64)
+
+        # chances falls back to A + PO + E when the API reports none
+        chances = stats[:, 7]
+        stats[:, 7] = np.where(chances != 0, chances, stats[:, 0] + stats[:, 1] + stats[:, 2])
+
+        keep = (stats[:, 7] > 0) | (stats[:, 3:7] > 0).any(axis=1)
+        if not keep.any():
+            return []
+
+        # A player listed on both sides has both lines summed, as before
+        uniq, inverse = np.unique(np.array(pids, dtype=np.int64)[keep], return_inverse=True)
+        totals = np.zeros((uniq.size, stats.shape[1]), dtype=np.int64)
+        np.add.at(totals, inverse, stats[keep])
+
+        return [
+            {"game_id": game_id, "player_id": pid, **dict(zip(FIELDING_STAT_COLS, values))}
+            for pid, values in zip(uniq.tolist(), totals.tolist())
         ]
-        fielding_rows: List[Dict[str, Any]] = list(fielding_by_pid.values())
-
-        return boxscore_rows, fielding_rows, player_ids
 
     def _fetch_playbyplay_worker(self, game_id: int) -> Optional[Dict[str, Any]]:
-        time.sleep(random.uniform(*JITTER_RANGE_S))
-        client = APIClient()
+        self._rate_limiter.acquire()
         url = f"https://statsapi.mlb.com/api/v1/game/{game_id}/playByPlay"
-        res = client.get(url, params=None) or {}
-        if not res.get("allPlays"):
+        res = self.api_client.get(url, params=None) or {}
+        plays = res.get("allPlays")
+        if not plays:
             return None
-        return res
+        # The aggregators only read allPlays; drop the rest of the decoded payload before it is queued
+        return {"allPlays": plays}
 
     def _upsert_game_boxscores(self, db_session, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
         if not rows:
             return 0, 0
 
-        stmt = (
-            insert(MLBGameBoxscore)
-            .values(rows)
-            .on_conflict_do_update(
-                index_elements=["game_id", "player_id"],
-                set_={"team_id": insert(MLBGameBoxscore).excluded["team_id"]},
-            )
-        )
-        db_session.execute(stmt)
-        db_session.flush()
+        self._boxscore_sink.extend(rows)
+        self._boxscore_sink.flush(db_session)
         return len(rows), len(rows)
 
-    def _upsert_batting_stats(self, db_session, rows: List[Dict[str, Any]]) -> None:
-        if not rows:
-            return
-
-        cols = MLBGameBattingStats.__table__.columns
-        update_cols = {
-            c.name: insert(MLBGameBattingStats).excluded[c.name]
-            for c in cols
-            if c.name not in {"game_id", "player_id", "split"}
-        }
-
-        stmt = (
-            insert(MLBGameBattingStats)
-            .values(rows)
-            .on_conflict_do_update(
-                index_elements=["game_id", "player_id", "split"],
-                set_=update_cols,
-            )
-        )
-        db_session.execute(stmt)
-        db_session.flush()
-
-    def _upsert_baserunning_stats(self, db_session, rows: List[Dict[str, Any]]) -> None:
-        if not rows:
-            return
-
-        stmt = (
-            insert(MLBGameBaserunningStats)
-            .values(rows)
-            .on_conflict_do_update(
-                index_elements=["game_id", "player_id"],
-                set_={
-                    "sb": insert(MLBGameBaserunningStats).excluded["sb"],
-                    "caught_stealing": insert(MLBGameBaserunningStats).excluded["caught_stealing"],
-                },
-            )
-        )
-        db_session.execute(stmt)
-        db_session.flush()
-
     def _upsert_fielding_stats(self, db_session, rows: List[Dict[str, Any]]) -> None:
-        if not rows:
-            return
+        self._fielding_sink.extend(rows)
+        self._fielding_sink.flush(db_session)
 
-        stmt = (
-            insert(MLBGameFieldingStats)
-            .values(rows)
-            .on_conflict_do_update(
-                index_elements=["game_id", "player_id"],
-                set_={
-                    "assists": insert(MLBGameFieldingStats).excluded["assists"],
-                    "put_outs": insert(MLBGameFieldingStats).excluded["put_outs"],
-                    "errors": insert(MLBGameFieldingStats).excluded["errors"],
-                    "chances": insert(MLBGameFieldingStats).excluded["chances"],
-                    "passed_balls": insert(MLBGameFieldingStats).excluded["passed_balls"],
-                    "pickoffs": insert(MLBGameFieldingStats).excluded["pickoffs"],
-                    "stolen_bases_allowed": insert(MLBGameFieldingStats).excluded["stolen_bases_allowed"],
-                    "caught_stealing": insert(MLBGameFieldingStats).excluded["caught_stealing"],
-                },
-            )
+    def _prime_player_exists_cache(self, db_session) -> None:
+        # COPY the id column out as plain text and decode it in one shot instead of going through ORM rows
+        buf = io.BytesIO()
+        cursor = db_session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY (SELECT mlb_id FROM {Player.__tablename__}) TO STDOUT", buf)
+        finally:
+            cursor.close()
+
+        ids = list(map(int, buf.getvalue().split()))
+        self._player_exists_cache = set(ids)
+        self._player_exists_arr = np.sort(np.array(ids, dtype=np.int64))
+
+    def _refresh_player_exists_arr(self) -> None:
+        # Kept sorted so membership is a binary search over the whole batch
+        self._player_exists_arr = np.sort(
+            np.fromiter(self._player_exists_cache, dtype=np.int64, count=len(self._player_exists_cache))
         )
-        db_session.execute(stmt)
-        db_session.flush()
-
-    def _upsert_pitching_stats(self, db_session, rows: List[Dict[str, Any]]) -> None:
-        if not rows:
-            return
-
-        cols = MLBGamePitchingStats.__table__.columns
-        # Upsert everything except PKs
-        update_cols = {
-            c.name: insert(MLBGamePitchingStats).excluded[c.name]
-            for c in cols
-            if c.name not in {"game_id", "player_id", "split"}
-        }
 
-        stmt = (
-            insert(MLBGamePitchingStats)
-            .values(rows)
-            .on_conflict_do_update(
-                index_elements=["game_id", "player_id", "split"],
-                set_=update_cols,
-            )
-        )
-        db_session.execute(stmt)
-        db_session.flush()
+    def _players_exist(self, player_ids: np.ndarray) -> np.ndarray:
+        known = self._player_exists_arr
+        if not known.size:
+            return np.zeros(player_ids.shape, dtype=bool)
 
-    def _prime_player_exists_cache(self, db_session) -> None:
-        self._player_exists_cache = set(db_session.execute(select(Player.mlb_id)).scalars().all())
+        idx = np.searchsorted(known, player_ids)
+        idx[idx == known.size] = 0
+        return known[idx] == player_ids
 
     def _fetch_people_bulk(self, mlb_ids: Set[int]) -> Dict[int, Optional[Dict[str, Any]]]:
-        out: Dict[int, Optional[Dict[str, Any]]] = {}
-
-        def worker(pid: int) -> Tuple[int, Optional[Dict[str, Any]]]:
-            time.sleep(random.uniform(*JITTER_RANGE_S))
-            client = APIClient()
-            url = f"https://statsapi.mlb.com/api/v1/people/{pid}"
-            res = client.get(url, params=None) or {}
-            people = res.get("people") or []
-            return int(pid), (people[0] if people else None)
-
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
-            futures = {pool.submit(worker, int(pid)): int(pid) for pid in sorted(mlb_ids)}
-            for fut in as_completed(futures):
-                pid = futures[fut]
-                try:
-                    k, person = fut.result()
-                    out[int(k)] = person
-                except Exception:
-                    out[int(pid)] = None
+        # Ids that don't come back in any response stay None and are counted as failed
+        out: Dict[int, Optional[Dict[str, Any]]] = {int(pid): None for pid in mlb_ids}
+        ids = list(out)
+
+        def worker(chunk: List[int]) -> List[Dict[str, Any]]:
+            self._rate_limiter.acquire()
+            url = "https://statsapi.mlb.com/api/v1/people"
+            res = self.api_client.get(url, {"personIds": ",".join(map(str, chunk))}) or {}
+            return res.get("people") or []
+
+        chunks = [ids[i : i + PEOPLE_CHUNK_SIZE] for i in range(0, len(ids), PEOPLE_CHUNK_SIZE)]
+        futures = {self._pool.submit(worker, chunk): chunk for chunk in chunks}
+        for fut in as_completed(futures):
+            try:
+                people = fut.result()
+            except Exception as e:
+                chunk = futures[fut]
+                self.logger.info(f"[PEOPLE_FETCH_FAILED] ids={chunk[0]}..{chunk[-1]} count={len(chunk)} err='{e}'")
+                continue
+
+            for person in people:
+                pid = person.get("id")
+                if pid is not None and int(pid) in out:
+                    out[int(pid)] = person
 
         return out
 
@@ -695,6 +739,9 @@ class GameBoxscoreSync(BaseJob):
         updated = 0
         failed = 0
 
+        positions: Dict[int, Dict[str, Any]] = {}
+        player_rows: List[Dict[str, Any]] = []
+
         for mlb_id, person in people_by_id.items():
             if person is None:
                 failed += 1
@@ -706,7 +753,11 @@ class GameBoxscoreSync(BaseJob):
                 failed += 1
                 continue
 
-            self._upsert_position(db_session, pos_id, str(pos.get("name") or ""), str(pos.get("abbreviation") or ""))
+            positions[int(pos_id)] = {
+                "id": int(pos_id),
+                "name": str(pos.get("name") or ""),
+                "abbreviation": str(pos.get("abbreviation") or ""),
+            }
 
             birth_loc_id = self._upsert_birth_location(
                 db_session,
@@ -723,31 +774,23 @@ class GameBoxscoreSync(BaseJob):
             row["birth_location_id"] = birth_loc_id
             row["position_id"] = int(pos_id)
 
-            existed = int(row["mlb_id"]) in self._player_exists_cache
-            self._upsert_player(db_session, row)
-            db_session.flush()
-
-            self._player_exists_cache.add(int(row["mlb_id"]))
-            if existed:
+            player_rows.append(row)
+            if int(row["mlb_id"]) in self._player_exists_cache:
                 updated += 1
             else:
                 created += 1
 
+        # Positions first for the FK, then players in multi-row batches rather than one statement per person
+        self._upsert_positions(db_session, list(positions.values()))
+        for i in range(0, len(player_rows), PLAYER_UPSERT_BATCH):
+            self._upsert_players(db_session, player_rows[i : i + PLAYER_UPSERT_BATCH])
+
+        self._player_exists_cache.update(int(row["mlb_id"]) for row in player_rows)
         return created, updated, failed
 
-    def _upsert_position(self, db_session, pos_id: int, name: str, abbr: str) -> None:
-        stmt = (
-            insert(MLBPosition)
-            .values({"id": int(pos_id), "name": name, "abbreviation": abbr})
-            .on_conflict_do_update(
-                index_elements=["id"],
-                set_={
-                    "name": insert(MLBPosition).excluded["name"],
-                    "abbreviation": insert(MLBPosition).excluded["abbreviation"],
-                },
-            )
-        )
-        db_session.execute(stmt)
+    def _upsert_positions(self, db_session, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            db_session.execute(_POSITION_UPSERT, rows)
 
     def _upsert_birth_location(
         self, db_session, city: str, state_province: Optional[str], country: str
@@ -760,17 +803,16 @@ class GameBoxscoreSync(BaseJob):
             return None
 
         key = (city.lower(), state_province, country.lower())
-        if key in self._birth_loc_cache:
-            return self._birth_loc_cache[key]
-
-        stmt = select(BirthLocation.id).where(
-            BirthLocation.city == city,
-            BirthLocation.country == country,
-            (BirthLocation.state_province.is_(None) if state_province is None else BirthLocation.state_province == state_province),
-        )
-        existing = db_session.execute(stmt).scalar_one_or_none()
+        cached = _KNOWN_BIRTH_LOC_IDS.get(key) or self._birth_loc_cache.get(key)
+        if cached is not None:
+            return cached
+
+        existing = db_session.execute(
+            _BIRTH_LOC_SELECT,
+            {"city": city, "country": country, "state_province": state_province},
+        ).scalar_one_or_none()
         if existing is not None:
-            self._birth_loc_cache[key] = int(existing)
+            _KNOWN_BIRTH_LOC_IDS[key] = int(existing)
             return int(existing)
 
         obj = BirthLocation(city=city, state_province=state_province, country=country)
@@ -780,43 +822,16 @@ class GameBoxscoreSync(BaseJob):
         self._birth_loc_cache[key] = int(obj.id)
         return int(obj.id)
 
-    def _upsert_player(self, db_session, row: Dict[str, Any]) -> None:
-        stmt = (
-            insert(Player)
-            .values(row)
-            .on_conflict_do_update(
-                index_elements=["mlb_id"],
-                set_={
-                    "full_name": insert(Player).excluded["full_name"],
-                    "first_name": insert(Player).excluded["first_name"],
-                    "last_name": insert(Player).excluded["last_name"],
-                    "number": insert(Player).excluded["number"],
-                    "birth_date": insert(Player).excluded["birth_date"],
-                    "current_age": insert(Player).excluded["current_age"],
-                    "birth_location_id": insert(Player).excluded["birth_location_id"],
-                    "height": insert(Player).excluded["height"],
-                    "weight": insert(Player).excluded["weight"],
-                    "active": insert(Player).excluded["active"],
-                    "current_team_id": insert(Player).excluded["current_team_id"],
-                    "position_id": insert(Player).excluded["position_id"],
-                    "boxscore_name": insert(Player).excluded["boxscore_name"],
-                    "draft_year": insert(Player).excluded["draft_year"],
-                    "mlb_debut_date": insert(Player).excluded["mlb_debut_date"],
-                    "bat_side_code": insert(Player).excluded["bat_side_code"],
-                    "pitch_hand_code": insert(Player).excluded["pitch_hand_code"],
-                    "strike_zone_top": insert(Player).excluded["strike_zone_top"],
-                    "strike_zone_bottom": insert(Player).excluded["strike_zone_bottom"],
-                },
-            )
-        )
-        db_session.execute(stmt)
+    def _upsert_players(self, db_session, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            db_session.execute(_PLAYER_UPSERT, rows)
 
     def _player_row_from_person(self, p: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         mlb_id = self._safe_int(p.get("id"))
         if mlb_id is None:
             return None
 
-        birth_date = self._parse_date(p.get("birthDate"))
+        birth_date = _parse_date(p.get("birthDate"))
         if birth_date is None:
             return None
 
@@ -828,7 +843,7 @@ class GameBoxscoreSync(BaseJob):
         weight = str(p.get("weight") or "") if p.get("weight") is not None else None
 
         draft_year = self._safe_int(p.get("draftYear"))
-        debut = self._parse_date(p.get("mlbDebutDate"))
+        debut = _parse_date(p.get("mlbDebutDate"))
 
         bat_side = p.get("batSide") or {}
         pitch_hand = p.get("pitchHand") or {}
@@ -859,28 +874,6 @@ class GameBoxscoreSync(BaseJob):
             "birth_location_id": None,
         }
 
-    def _parse_dt_utc_naive(self, s: Any) -> Optional[datetime.datetime]:
-        if not s:
-            return None
-        try:
-            txt = str(s).strip()
-            if txt.endswith("Z"):
-                txt = txt[:-1] + "+00:00"
-            dt = datetime.datetime.fromisoformat(txt)
-            if dt.tzinfo is not None:
-                dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
-            return dt
-        except Exception:
-            return None
-
-    def _parse_date(self, s: Any) -> Optional[datetime.date]:
-        if not s:
-            return None
-        try:
-            return datetime.date.fromisoformat(str(s).strip())
-        except Exception:
-            return None
-
     def _safe_int(self, v: Any) -> Optional[int]:
         try:
             if v is None:
@@ -1,32 +1,219 @@
 from __future__ import annotations
 
-import random
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-
-from sqlalchemy import delete, func, select, text
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import psycopg2
+from sqlalchemy import delete, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from src.core.config import THE_SHOW_YEARS
+from src.core.rate_limiter import RateLimiter
+from src.database.bulk import CopyUpsertBuffer
 from src.database.models import Card, CompletedOrder, Listing, PriceHistory
 from src.jobs.base import BaseJob
 
+CHUNK_SIZE = 200
+FETCH_WORKERS = 16
+# Shared budget for TheShow listing API across all fetch workers
+REQUESTS_PER_SECOND = 10
+# Backpressure for the fetch pipeline: at most two chunks' worth of requests queued ahead of the writer
+MAX_IN_FLIGHT = 2 * CHUNK_SIZE
+
+# Rows are built as positional tuples in these column orders and handed to the COPY sinks as-is
+LISTING_COLS = ("card_id", "best_buy_price", "best_sell_price")
+ORDER_COLS = ("card_id", "date", "price", "is_buy")
+PRICE_HISTORY_COLS = ("card_id", "date", "best_buy_price", "best_sell_price", "volume")
+
+ListingRow = Tuple[str, Optional[int], Optional[int]]
+OrderRow = Tuple[str, datetime, int, Optional[bool]]
+PriceHistoryRow = Tuple[str, date, Optional[int], Optional[int], Optional[int]]
+PRICE_HISTORY_FLUSH_ROWS = 10_000
+
+# The 48h order windows overlap heavily between runs and across cards, and price history only ever
+# covers the season's few hundred days, so both parsers are memoized on the raw string
+@lru_cache(maxsize=65536)
+def _parse_order_ts(dt_str: str) -> datetime:
+    s = dt_str
+    # "MM/DD/YYYY HH:MM:SS" sliced by position; anything else goes through strptime
+    if len(s) == 19 and s[2] == "/" and s[5] == "/" and s[10] == " " and s[13] == ":" and s[16] == ":":
+        return datetime(int(s[6:10]), int(s[0:2]), int(s[3:5]), int(s[11:13]), int(s[14:16]), int(s[17:19]))
+    return datetime.strptime(s, "%m/%d/%Y %H:%M:%S")
+
+
+@lru_cache(maxsize=4096)
+def _parse_history_date(season_year: int, mmdd: str) -> date:
+    mm, dd = mmdd.split("/")
+    return date(season_year, int(mm), int(dd))
+
+
+def _to_int_price(v: Any) -> Optional[int]:
+    if v is None:
+        return None
+    if isinstance(v, int):
+        return v
+    # Normalized before the cache so any payload value, hashable or not, parses the way it always did
+    return _parse_price_str(str(v))
+
+
+# Price strings like "1,250" repeat across price history rows and cards
+@lru_cache(maxsize=4096)
+def _parse_price_str(v: str) -> Optional[int]:
+    s = v.strip().replace(",", "")
+    if not s:
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _infer_labels_cached(
+    prices: Tuple[int, ...],
+    best_buy_price: Optional[int],
+    best_sell_price: Optional[int],
+) -> Tuple[Optional[bool], ...]:
+    # Pure function of the order prices and anchors; most cards' 48h windows barely move between runs
+    n = len(prices)
+
+    def _valid_anchor(x: Optional[int]) -> Optional[int]:
+        if x is None:
+            return None
+        try:
+            x = int(x)
+        except Exception:
+            return None
+        return x if x > 0 else None
+
+    bb = _valid_anchor(best_buy_price)
+    bs = _valid_anchor(best_sell_price)
+
+    if bb is not None and bs is not None and bs < bb:
+        bb, bs = bs, bb
+
+    p = np.asarray(prices, dtype=np.int64)
+
+    if bb is not None and bs is not None and bs >= bb:
+        spread = bs - bb
+        tol = max(1, int(round(0.10 * spread)), int(round(0.002 * max(bs, bb))))
+        mid = (bb + bs) / 2.0
+
+        # Near the sell anchor -> buy; else near the buy anchor -> sell; else whichever side of mid
+        out = (np.abs(p - bs) <= tol) | ((np.abs(p - bb) > tol) & (p > mid))
+
+        if not out.any() or out.all():
+            return (None,) * n
+
+        return tuple(out.tolist())
+
+    # Only the min, max and two quartile ranks are needed, so select them instead of sorting
+    i1, i3 = int(0.25 * (n - 1)), int(0.75 * (n - 1))
+    p_part = np.partition(p, sorted({0, i1, i3, n - 1}))
+    if p_part[0] == p_part[-1]:
+        return (None,) * n
+
+    q1 = p_part[i1]
+    q3 = p_part[i3]
+    c1 = float(q1)
+    c2 = float(q3 if q3 != q1 else p_part[-1])
+
+    for _ in range(15):
+        mask = np.abs(p - c1) <= np.abs(p - c2)
+        g1_n = int(np.count_nonzero(mask))
+        if g1_n == 0 or g1_n == n:
+            return (None,) * n
+
+        nc1 = float(p[mask].mean())
+        nc2 = float(p[~mask].mean())
+
+        if abs(nc1 - c1) < 1e-6 and abs(nc2 - c2) < 1e-6:
+            break
+
+        c1, c2 = nc1, nc2
+
+    low_mean, high_mean = (c1, c2) if c1 <= c2 else (c2, c1)
+    sep = high_mean - low_mean
+    if sep <= 0:
+        return (None,) * n
+
+    level = max(1.0, (low_mean + high_mean) / 2.0)
+    if sep < max(1.0, 0.002 * level):
+        return (None,) * n
+
+    threshold = (low_mean + high_mean) / 2.0
+    labels = p > threshold
+    buy_ct = int(np.count_nonzero(labels))
+    sell_ct = n - buy_ct
+    if buy_ct < max(2, n // 20) or sell_ct < max(2, n // 20):
+        return (None,) * n
+
+    return tuple(labels.tolist())
+
 
 class MarketSync(BaseJob):
     def __init__(self):
         super().__init__()
         self.set_child_instance(self)
         self.year = THE_SHOW_YEARS[0]
+        self._listing_url = f"https://mlb{self.year}.theshow.com/apis/listing.json"
+        self._pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+        self._rate_limiter = RateLimiter(REQUESTS_PER_SECOND, burst=REQUESTS_PER_SECOND)
+
+        # Chunks big enough go through COPY into a temp table and one INSERT ... SELECT ... ON CONFLICT merge
+        # Most listings are unchanged between runs; those conflict into a no-op instead of a new row version
+        listings = Listing.__tablename__
+        self._listing_sink = CopyUpsertBuffer(
+            Listing.__table__,
+            ["card_id"],
+            ["best_buy_price", "best_sell_price"],
+            update_where=(
+                f'("{listings}"."best_buy_price", "{listings}"."best_sell_price") '
+                'IS DISTINCT FROM (EXCLUDED."best_buy_price", EXCLUDED."best_sell_price")'
+            ),
+            columns=LISTING_COLS,
+        )
+        # A fill never changes its price; only a label that was still unknown gets filled in later
+        orders = CompletedOrder.__tablename__
+        self._order_sink = CopyUpsertBuffer(
+            CompletedOrder.__table__,
+            ["card_id", "date"],
+            ["is_buy"],
+            update_where=f'"{orders}"."is_buy" IS NULL AND EXCLUDED."is_buy" IS NOT NULL',
+            columns=ORDER_COLS,
+        )
+        # Price history is buffered across chunks; a NULL volume never overwrites one already recorded
+        self._ph_sink = CopyUpsertBuffer(
+            PriceHistory.__table__,
+            ["card_id", "date"],
+            ["best_buy_price", "best_sell_price", "volume"],
+            update_set={
+                "volume": f'COALESCE(EXCLUDED."volume", "{PriceHistory.__tablename__}"."volume")',
+            },
+            columns=PRICE_HISTORY_COLS,
+        )
 
     def execute(self, db_session: Session):
+        try:
+            self._sync(db_session)
+        finally:
+            # On failure, drop queued page fetches instead of running them through the rate limiter first
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _sync(self, db_session: Session):
         self.logger.info("Starting MarketSync Execution...")
 
         season_year = 2000 + self.year
         now = datetime.utcnow()
         cutoff = now - timedelta(hours=48)
+        # Job-wide constants for the price-history volume backfill
+        yesterday = (now - timedelta(days=1)).date()
+        start_yesterday = datetime(yesterday.year, yesterday.month, yesterday.day)
 
         card_keys = self._get_card_keys(db_session)  # (derived_id, source_uuid)
         self.logger.info(f"Syncing market data for {len(card_keys)} cards (mlb{self.year})")
@@ -34,307 +221,232 @@ class MarketSync(BaseJob):
         db_session.execute(delete(CompletedOrder).where(CompletedOrder.date < cutoff))
         db_session.commit()
 
-        chunk_size = 200
         total = len(card_keys)
+        for done, payloads in self._iter_payload_batches(card_keys):
+            n_listing, n_orders, n_ph = self._write_chunk(
+                db_session, payloads, season_year, cutoff, yesterday, start_yesterday
+            )
+            self.logger.info(
+                f"Progress: {done}/{total} payloads={len(payloads)} "
+                f"listing_rows={n_listing} order_rows={n_orders} ph_rows={n_ph}"
+            )
 
-        for start in range(0, total, chunk_size):
-            chunk = card_keys[start : start + chunk_size]
-
-            payloads: List[Tuple[str, Dict[str, Any]]] = []
-            with ThreadPoolExecutor(max_workers=2) as ex:
-                futures = {
-                    ex.submit(self._fetch_market_payload_jitter, source_uuid): (card_id, source_uuid)
-                    for (card_id, source_uuid) in chunk
-                }
-                for fut in as_completed(futures):
-                    card_id, source_uuid = futures[fut]
-                    try:
-                        payload = fut.result()
-                    except Exception as e:
-                        self.logger.error(f"Card {card_id} ({source_uuid}) fetch failed: {e}", exc_info=True)
-                        continue
-                    if payload:
-                        payloads.append((card_id, payload))
-
-            listing_rows: List[Dict[str, Any]] = []
-            order_rows: List[Dict[str, Any]] = []
-            ph_rows: List[Dict[str, Any]] = []
-
-            for card_id, payload in payloads:
-                out = self._build_rows_from_payload(
-                    payload=payload,
-                    card_id=card_id,
-                    season_year=season_year,
-                    now=now,
-                    cutoff=cutoff,
-                )
-                if not out:
+        self._ph_sink.flush(db_session)
+        db_session.commit()
+        self.logger.info("MarketSync complete.")
+
+    def _iter_payload_batches(
+        self, card_keys: List[Tuple[str, str]]
+    ) -> Iterator[Tuple[int, List[Tuple[str, Dict[str, Any]]]]]:
+        """Yield (cards_done, payloads) batches of about CHUNK_SIZE payloads in completion order.
+
+        Up to MAX_IN_FLIGHT fetches stay queued on the pool, so requests keep going while the caller writes a
+        batch, and one slow card never holds back the ones that finished after it.
+        """
+        keys = iter(card_keys)
+        in_flight: Dict[Future, Tuple[str, str]] = {}
+
+        def top_up() -> None:
+            for card_id, source_uuid in islice(keys, MAX_IN_FLIGHT - len(in_flight)):
+                in_flight[self._pool.submit(self._fetch_market_payload, source_uuid)] = (card_id, source_uuid)
+
+        top_up()
+        done = 0
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                card_id, source_uuid = in_flight.pop(fut)
+                done += 1
+                try:
+                    payload = fut.result()
+                except Exception as e:
+                    self.logger.error(f"Card {card_id} ({source_uuid}) fetch failed: {e}", exc_info=True)
                     continue
-                lrow, orows, prows = out
-                if lrow:
-                    listing_rows.append(lrow)
-                if orows:
-                    order_rows.extend(orows)
-                if prows:
-                    ph_rows.extend(prows)
-
-            if listing_rows or order_rows or ph_rows:
-                db_session.execute(text("SET LOCAL synchronous_commit TO OFF"))
-
-            if listing_rows:
-                stmt = pg_insert(Listing).values(listing_rows).on_conflict_do_update(
-                    index_elements=["card_id"],
-                    set_={
-                        "best_buy_price": pg_insert(Listing).excluded.best_buy_price,
-                        "best_sell_price": pg_insert(Listing).excluded.best_sell_price,
-                    },
-                )
-                db_session.execute(stmt)
-
-            if order_rows:
-                stmt = pg_insert(CompletedOrder).values(order_rows).on_conflict_do_update(
-                    index_elements=["card_id", "date"],
-                    set_={
-                        "price": pg_insert(CompletedOrder).excluded.price,
-                        "is_buy": pg_insert(CompletedOrder).excluded.is_buy,
-                    },
-                )
-                db_session.execute(stmt)
-
-            if ph_rows:
-                excluded = pg_insert(PriceHistory).excluded
-                stmt = pg_insert(PriceHistory).values(ph_rows).on_conflict_do_update(
-                    index_elements=["card_id", "date"],
-                    set_={
-                        "best_buy_price": excluded.best_buy_price,
-                        "best_sell_price": excluded.best_sell_price,
-                        "volume": func.coalesce(excluded.volume, PriceHistory.volume),
-                    },
-                )
-                db_session.execute(stmt)
+                if payload:
+                    batch.append((card_id, payload))
+            top_up()
 
-            db_session.commit()
+            if len(batch) >= CHUNK_SIZE:
+                yield done, batch
+                batch = []
 
-            done = min(start + chunk_size, total)
-            self.logger.info(
-                f"Progress: {done}/{total} payloads={len(payloads)} "
-                f"listing_rows={len(listing_rows)} order_rows={len(order_rows)} ph_rows={len(ph_rows)}"
+        if batch:
+            yield done, batch
+
+    def _write_chunk(
+        self,
+        db_session: Session,
+        payloads: List[Tuple[str, Dict[str, Any]]],
+        season_year: int,
+        cutoff: datetime,
+        yesterday: date,
+        start_yesterday: datetime,
+    ) -> Tuple[int, int, int]:
+        built: List[Tuple[str, ListingRow, List[OrderRow], List[PriceHistoryRow]]] = []
+        for card_id, payload in payloads:
+            out = self._build_rows_from_payload(
+                payload=payload,
+                card_id=card_id,
+                season_year=season_year,
+                cutoff=cutoff,
+                yesterday=yesterday,
+                start_yesterday=start_yesterday,
             )
+            if out:
+                built.append((card_id, *out))
 
-        self.logger.info("MarketSync complete.")
+        if not built:
+            db_session.commit()
+            return 0, 0, 0
+
+        db_session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+
+        listing_rows = [lrow for _, lrow, _, _ in built]
+        order_rows = [o for _, _, orows, _ in built for o in orows]
+        ph_rows = [p for _, _, _, prows in built for p in prows]
+
+        # One savepoint for the whole chunk; only if it fails do we pay for a savepoint per card
+        try:
+            with db_session.begin_nested():
+                self._write_rows(db_session, listing_rows, order_rows)
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            self.logger.warning(f"Chunk write failed, retrying {len(built)} cards individually: {e}")
+            listing_rows, order_rows, ph_rows = [], [], []
+            for card_id, lrow, orows, prows in built:
+                lrows = [lrow]
+                try:
+                    with db_session.begin_nested():
+                        self._write_rows(db_session, lrows, orows)
+                except (SQLAlchemyError, psycopg2.Error) as card_err:
+                    self.logger.error(f"Card {card_id} write failed: {card_err}")
+                    continue
+                listing_rows.extend(lrows)
+                order_rows.extend(orows)
+                ph_rows.extend(prows)
+
+        # Listings are written with the chunk that produced them, so the FK target exists by the time this flushes
+        self._ph_sink.extend_tuples(ph_rows)
+        if len(self._ph_sink) >= PRICE_HISTORY_FLUSH_ROWS:
+            self._ph_sink.flush(db_session)
+
+        db_session.commit()
+        return len(listing_rows), len(order_rows), len(ph_rows)
+
+    def _write_rows(
+        self,
+        db_session: Session,
+        listing_rows: List[ListingRow],
+        order_rows: List[OrderRow],
+    ) -> None:
+        self._listing_sink.extend_tuples(listing_rows)
+        self._listing_sink.flush(db_session)
+        self._order_sink.extend_tuples(order_rows)
+        self._order_sink.flush(db_session)
 
     def _get_card_keys(self, session: Session) -> List[Tuple[str, str]]:
-        stmt = select(Card.id, Card.source_uuid).where(Card.year == self.year)
-        rows = session.execute(stmt).all()
-        return [(r[0], r[1]) for r in rows if r[0] and r[1]]
-
-    def _fetch_market_payload_jitter(self, source_uuid: str) -> Optional[Dict[str, Any]]:
-        time.sleep(random.uniform(0.1, 0.3))
-        url = f"https://mlb{self.year}.theshow.com/apis/listing.json"
-        params = {"uuid": source_uuid}
-        return self.api_client.get(url, params)
-
-    def _to_int_price(self, v: Any) -> Optional[int]:
-        if v is None:
-            return None
-        if isinstance(v, int):
-            return v
-        s = str(v).strip().replace(",", "")
-        if not s:
-            return None
+        # Plain DBAPI tuples; this runs once per job over every card of the year
+        cursor = session.connection().connection.cursor()
         try:
-            return int(s)
-        except ValueError:
-            return None
+            # Both columns are NOT NULL; the empty-string check that used to run in Python is done here
+            cursor.execute(
+                f"SELECT id, source_uuid FROM {Card.__tablename__} "
+                "WHERE year = %s AND id <> '' AND source_uuid <> ''",
+                (self.year,),
+            )
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _fetch_market_payload(self, source_uuid: str) -> Optional[Dict[str, Any]]:
+        self._rate_limiter.acquire()
+        return self.api_client.get(self._listing_url, {"uuid": source_uuid})
 
     def _infer_buy_sell_labels(
         self,
-        parsed: List[Tuple[datetime, int]],
+        prices: Tuple[int, ...],
         best_buy_price: Optional[int] = None,
         best_sell_price: Optional[int] = None,
     ) -> List[Optional[bool]]:
-        n = len(parsed)
-        if n == 0:
+        if not prices:
             return []
-
-        prices = [p for _, p in parsed]
-
-        def _valid_anchor(x: Optional[int]) -> Optional[int]:
-            if x is None:
-                return None
-            try:
-                x = int(x)
-            except Exception:
-                return None
-            return x if x > 0 else None
-
-        bb = _valid_anchor(best_buy_price)
-        bs = _valid_anchor(best_sell_price)
-
-        if bb is not None and bs is not None and bs < bb:
-            bb, bs = bs, bb
-
-        if bb is not None and bs is not None and bs >= bb:
-            spread = bs - bb
-            tol = max(1, int(round(0.10 * spread)), int(round(0.002 * max(bs, bb))))
-            mid = (bb + bs) / 2.0
-
-            out: List[Optional[bool]] = []
-            for p in prices:
-                if abs(p - bs) <= tol:
-                    out.append(True)
-                elif abs(p - bb) <= tol:
-                    out.append(False)
-                else:
-                    out.append(p > mid)
-
-            has_buy = any(x is True for x in out)
-            has_sell = any(x is False for x in out)
-            if not (has_buy and has_sell):
-                return [None] * n
-
-            return out
-
-        p_sorted = sorted(prices)
-        if p_sorted[0] == p_sorted[-1]:
-            return [None] * n
-
-        q1 = p_sorted[int(0.25 * (n - 1))]
-        q3 = p_sorted[int(0.75 * (n - 1))]
-        c1 = q1
-        c2 = q3 if q3 != q1 else p_sorted[-1]
-
-        for _ in range(15):
-            g1_sum = g1_n = 0
-            g2_sum = g2_n = 0
-
-            for p in prices:
-                if abs(p - c1) <= abs(p - c2):
-                    g1_sum += p
-                    g1_n += 1
-                else:
-                    g2_sum += p
-                    g2_n += 1
-
-            if g1_n == 0 or g2_n == 0:
-                return [None] * n
-
-            nc1 = g1_sum / g1_n
-            nc2 = g2_sum / g2_n
-
-            if abs(nc1 - c1) < 1e-6 and abs(nc2 - c2) < 1e-6:
-                break
-
-            c1, c2 = nc1, nc2
-
-        low_mean, high_mean = (c1, c2) if c1 <= c2 else (c2, c1)
-        sep = high_mean - low_mean
-        if sep <= 0:
-            return [None] * n
-
-        level = max(1.0, (low_mean + high_mean) / 2.0)
-        if sep < max(1.0, 0.002 * level):
-            return [None] * n
-
-        threshold = (low_mean + high_mean) / 2.0
-        labels = [p > threshold for p in prices]
-        buy_ct = sum(1 for x in labels if x)
-        sell_ct = n - buy_ct
-        if buy_ct < max(2, n // 20) or sell_ct < max(2, n // 20):
-            return [None] * n
-
-        return labels
+        return list(_infer_labels_cached(prices, best_buy_price, best_sell_price))
 
     def _build_rows_from_payload(
         self,
         payload: Dict[str, Any],
         card_id: str,
         season_year: int,
-        now: datetime,
         cutoff: datetime,
-    ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        yesterday: date,
+        start_yesterday: datetime,
+    ) -> Optional[Tuple[ListingRow, List[OrderRow], List[PriceHistoryRow]]]:
         if not card_id:
             return None
 
-        best_buy = self._to_int_price(payload.get("best_buy_price"))
-        best_sell = self._to_int_price(payload.get("best_sell_price"))
+        best_buy = _to_int_price(payload.get("best_buy_price"))
+        best_sell = _to_int_price(payload.get("best_sell_price"))
 
-        listing_row = {
-            "card_id": card_id,
-            "best_buy_price": best_buy,
-            "best_sell_price": best_sell,
-        }
+        listing_row: ListingRow = (card_id, best_buy, best_sell)
 
         completed_orders_payload = payload.get("completed_orders") or []
-        seen_ts: set[datetime] = set()
-        parsed: List[Tuple[datetime, int]] = []
+        # Insertion-ordered, so one dict is both the duplicate check and the order list
+        price_by_ts: Dict[datetime, int] = {}
 
         for it in completed_orders_payload:
             dt_str = it.get("date")
-            price_int = self._to_int_price(it.get("price"))
+            price_int = _to_int_price(it.get("price"))
             if not dt_str or price_int is None:
                 continue
             try:
-                ts = datetime.strptime(dt_str, "%m/%d/%Y %H:%M:%S")
+                ts = _parse_order_ts(dt_str)
             except ValueError:
                 continue
-            if ts < cutoff:
+            if ts < cutoff or ts in price_by_ts:
                 continue
-            if ts in seen_ts:
-                continue
-            seen_ts.add(ts)
-            parsed.append((ts, price_int))
-
-        labels = self._infer_buy_sell_labels(parsed, best_buy, best_sell)
-
-        order_rows: List[Dict[str, Any]] = []
-        for (ts, price_int), is_buy in zip(parsed, labels):
-            order_rows.append(
-                {
-                    "card_id": card_id,
-                    "date": ts,
-                    "price": price_int,
-                    "is_buy": is_buy,
-                }
-            )
+            price_by_ts[ts] = price_int
 
-        yesterday = (now - timedelta(days=1)).date()
-        start_yesterday = datetime(yesterday.year, yesterday.month, yesterday.day, 0, 0, 0)
+        labels = self._infer_buy_sell_labels(tuple(price_by_ts.values()), best_buy, best_sell)
+
+        order_rows: List[OrderRow] = [
+            (card_id, ts, price_int, is_buy) for (ts, price_int), is_buy in zip(price_by_ts.items(), labels)
+        ]
 
-        earliest_ts = min((ts for ts, _ in parsed), default=None)
-        is_truncated = (len(parsed) >= 200)
+
+        earliest_ts = min(price_by_ts, default=None)
+        is_truncated = (len(price_by_ts) >= 200)
         can_compute_yesterday = (earliest_ts is not None) and (earliest_ts <= start_yesterday) and (not is_truncated)
 
-        orders_by_date: Dict[Any, int] = {}
+        # Only yesterday's count is ever read back
+        yesterday_volume = 0
         if can_compute_yesterday:
-            for ts, _ in parsed:
-                d = ts.date()
-                orders_by_date[d] = orders_by_date.get(d, 0) + 1
+            yesterday_ord = yesterday.toordinal()
+            yesterday_volume = sum(1 for ts in price_by_ts if ts.toordinal() == yesterday_ord)
 
         price_history_payload = payload.get("price_history") or []
-        ph_rows: List[Dict[str, Any]] = []
+        ph_rows: List[PriceHistoryRow] = []
 
         for it in price_history_payload:
             mmdd = it.get("date")
             if not mmdd:
                 continue
             try:
-                d = datetime.strptime(f"{season_year}/{mmdd}", "%Y/%m/%d").date()
+                d = _parse_history_date(season_year, mmdd)
             except ValueError:
                 continue
 
             volume = None
             if d == yesterday and can_compute_yesterday:
-                volume = orders_by_date.get(d, 0)
+                volume = yesterday_volume
 
             ph_rows.append(
-                {
-                    "card_id": card_id,
-                    "date": d,
-                    "best_buy_price": self._to_int_price(it.get("best_buy_price")),
-                    "best_sell_price": self._to_int_price(it.get("best_sell_price")),
-                    "volume": volume,
-                }
+                (
+                    card_id,
+                    d,
+                    _to_int_price(it.get("best_buy_price")),
+                    _to_int_price(it.get("best_sell_price")),
+                    volume,
+                )
             )
 
         return listing_row, order_rows, ph_rows
@@ -1,24 +1,173 @@
 from __future__ import annotations
 
 import datetime
+import heapq
+import logging
 import random
 import re
 import time
 import unicodedata
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 from statistics import median
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import func, select, update
+import requests
+from psycopg2.extras import execute_values
+from sqlalchemy import bindparam, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 
-from src.core.http_client import APIClient
+from src.core.rate_limiter import RateLimiter
 from src.database.models import BirthLocation, Card, MLBPosition, Player
 from src.jobs.base import BaseJob
 
 
 PITCHER_ABBRS = {"P", "SP", "RP", "CP"}
-MAX_WORKERS = 6
-JITTER_RANGE_S = (0.05, 0.45)
+MAX_WORKERS = 8
+# Shared StatsAPI request budget across all search workers
+REQUESTS_PER_SECOND = 10
+# Transient search failures (timeouts, 429, 5xx) are retried with full-jitter exponential backoff
+SEARCH_ATTEMPTS = 4
+RETRY_BASE_S = 0.25
+RETRY_CAP_S = 8.0
+# Matched players and card links are written in batches of this many rows
+PLAYER_UPSERT_BATCH = 500
+
+# players text columns copied straight from the people payload, empty string when missing
+_PLAYER_TEXT_FIELDS = (
+    ("full_name", "fullName"),
+    ("first_name", "firstName"),
+    ("last_name", "lastName"),
+    ("number", "primaryNumber"),
+    ("boxscore_name", "boxscoreName"),
+)
+
+_PLAYER_INSERT = insert(Player)
+_PLAYER_UPSERT = _PLAYER_INSERT.on_conflict_do_update(
+    index_elements=["mlb_id"],
+    set_={c.name: _PLAYER_INSERT.excluded[c.name] for c in Player.__table__.columns if c.name != "mlb_id"},
+)
+
+_BIRTH_LOC_INSERT = (
+    insert(BirthLocation)
+    .values(
+        city=bindparam("city"),
+        state_province=bindparam("state_province"),
+        country=bindparam("country"),
+    )
+    .on_conflict_do_nothing(constraint="uq_birth_locations_city_state_country")
+    .returning(BirthLocation.id)
+)
+_BIRTH_LOC_SELECT = select(BirthLocation.id).where(
+    BirthLocation.city == bindparam("city"),
+    BirthLocation.country == bindparam("country"),
+    BirthLocation.state_province.is_not_distinct_from(bindparam("state_province")),
+)
+
+_CARD_LINK_SQL = f"""
+    UPDATE {Card.__tablename__} AS c
+       SET mlb_id = v.mlb_id
+      FROM (VALUES %s) AS v(name, born, mlb_id)
+     WHERE c.name = v.name
+       AND c.born = v.born
+       AND c.mlb_id IS NULL
+"""
+
+
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+# Same substitution as _NON_WORD_RE for ASCII input, applied in one C-level translate pass
+_ASCII_NON_WORD_TABLE = str.maketrans({chr(i): " " for i in range(128) if _NON_WORD_RE.match(chr(i))})
+
+
+def _score_key(scored_person: Tuple[int, Dict[str, Any]]) -> int:
+    return scored_person[0]
+
+
+# Names and birthplaces recur across cards and API candidates, so normalization is memoized per string
+@lru_cache(maxsize=200_000)
+def _norm(s: str) -> str:
+    if not s:
+        return ""
+    if s.isascii():
+        # Most names and birthplaces: nothing to decompose, so skip NFKD and the combining-char filter
+        return " ".join(s.lower().translate(_ASCII_NON_WORD_TABLE).split())
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    s = _NON_WORD_RE.sub(" ", s.lower())
+    return " ".join(s.split())
+
+
+@lru_cache(maxsize=200_000)
+def _norm_name(s: str) -> str:
+    base = _norm(s)
+    if not base:
+        return ""
+
+    tokens = base.split()
+    joined: List[str] = []
+    i = 0
+    while i < len(tokens):
+        if len(tokens[i]) == 1:
+            j = i
+            buf = []
+            while j < len(tokens) and len(tokens[j]) == 1:
+                buf.append(tokens[j])
+                j += 1
+            if len(buf) >= 2:
+                joined.append("".join(buf))
+            else:
+                joined.append(buf[0])
+            i = j
+        else:
+            joined.append(tokens[i])
+            i += 1
+
+    return " ".join(joined)
+
+
+_HEIGHT_RE = re.compile(r"(\d+)\s*'\s*(\d+)")
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _digit_run(s: str, from_end: bool) -> str:
+    n = len(s)
+    i = 0
+    if from_end:
+        while i < n and s[n - 1 - i].isdecimal():
+            i += 1
+        return s[n - i:]
+    while i < n and s[i].isdecimal():
+        i += 1
+    return s[:i]
+
+
+# Heights/weights repeat across cards and candidates; plain feet'inches strings skip the regex entirely
+@lru_cache(maxsize=4096)
+def _height_to_inches(h: Any) -> Optional[int]:
+    if not h:
+        return None
+    s = str(h).strip()
+    ft, sep, rest = s.partition("'")
+    if sep:
+        ft = _digit_run(ft.rstrip(), from_end=True)
+        inch = _digit_run(rest.lstrip(), from_end=False)
+        if ft and inch:
+            return int(ft) * 12 + int(inch)
+    # Anything else (e.g. a later apostrophe) goes through the original pattern
+    m = _HEIGHT_RE.search(s)
+    if not m:
+        return None
+    return int(m.group(1)) * 12 + int(m.group(2))
+
+
+@lru_cache(maxsize=4096)
+def _weight_to_lbs(w: Any) -> Optional[int]:
+    if w is None or w == "":
+        return None
+    if isinstance(w, (int, float)):
+        return int(w)
+    m = _DIGITS_RE.search(str(w))
+    return int(m.group(1)) if m else None
 
 
 class PlayerSync(BaseJob):
@@ -28,18 +177,38 @@ class PlayerSync(BaseJob):
         self.rerun_all_cards = rerun_all_cards
         self.flush_every = flush_every
         self._group_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        # Keyed by mlb_id so one batch never carries the same player twice (ON CONFLICT rejects that)
+        self._player_buf: Dict[int, Dict[str, Any]] = {}
+        self._card_link_buf: List[Tuple[str, str, int]] = []
+        self._birthloc_cache: Dict[Tuple[str, Optional[str], str], Optional[int]] = {}
+        self._positions_seen: Set[int] = set()
+        self._profile_rows: Dict[Tuple[str, str], List[Tuple[Optional[bool], Any, Any]]] = {}
+        self._rate_limiter = RateLimiter(REQUESTS_PER_SECOND, burst=MAX_WORKERS)
 
     def execute(self, db_session):
         self.logger.info(f"Starting PlayerSync... rerun_all_cards={self.rerun_all_cards}")
 
+        self._player_buf.clear()
+        self._card_link_buf.clear()
+        self._birthloc_cache.clear()
         self._ensure_unknown_position(db_session)
+        # Only ~20 positions exist; anything already stored never needs another merge
+        self._positions_seen = set(db_session.execute(select(MLBPosition.id)).scalars())
 
         stmt = select(Card.name, Card.born).where(Card.name.is_not(None))
         if not self.rerun_all_cards:
             stmt = stmt.where(Card.mlb_id.is_(None))
         stmt = stmt.distinct()
 
-        rows = db_session.execute(stmt).yield_per(500)
+        # Materialized up front (bounded by the card count) so no server cursor stays open while drain writes
+        # through the same session
+        pairs = db_session.execute(stmt).all()
+
+        if not self.rerun_all_cards:
+            self._prewarm_group_cache(db_session)
+
+        # Card rows for every group in scope, fetched once instead of one SELECT per searched group
+        self._load_card_profile_rows(db_session, stmt.correlate(None))
 
         processed = 0
         upserted_players = 0
@@ -48,6 +217,9 @@ class PlayerSync(BaseJob):
         no_match = 0
         skipped = 0
 
+        # Per-row lines use lazy %-formatting; the top-3 miss summary is only built when INFO is enabled
+        log_info = self.logger.isEnabledFor(logging.INFO)
+
         with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
             pending: Dict[Any, Tuple[str, str, Dict[str, Any], Tuple[str, str]]] = {}
 
@@ -61,28 +233,31 @@ class PlayerSync(BaseJob):
                         people = fut.result()
                     except Exception as e:
                         skipped += 1
-                        self.logger.info(f"[ERROR] name='{name}' born='{born}' err='{e}'")
+                        self.logger.info("[ERROR] name='%s' born='%s' err='%s'", name, born, e)
                         continue
 
                     if not people:
                         self._group_cache[group_key] = None
                         no_results += 1
-                        self.logger.info(f"[NO_RESULTS] name='{name}' born='{born}'")
+                        self.logger.info("[NO_RESULTS] name='%s' born='%s'", name, born)
                         continue
 
+                    # Only the best candidate and, on a miss, the top 3 are ever used, so no full sort
                     scored = self._score_all_candidates(name, people, profile)
-                    scored.sort(key=lambda x: x[0], reverse=True)
                     if not scored:
                         self._group_cache[group_key] = None
                         no_match += 1
-                        self._log_top3_misses(name, born, profile, scored[:3], reason="EMPTY")
+                        if log_info:
+                            self._log_top3_misses(name, born, profile, [], reason="EMPTY")
                         continue
 
                     person = self._pick_best_person(name, born, profile, scored)
                     if not person:
                         self._group_cache[group_key] = None
                         no_match += 1
-                        self._log_top3_misses(name, born, profile, scored[:3], reason="NO_MATCH")
+                        if log_info:
+                            top3 = heapq.nlargest(3, scored, key=_score_key)
+                            self._log_top3_misses(name, born, profile, top3, reason="NO_MATCH")
                         continue
 
                     mlb_id = person.get("id")
@@ -96,22 +271,16 @@ class PlayerSync(BaseJob):
 
                     if self._upsert_player(db_session, person):
                         upserted_players += 1
-
-                    db_session.flush()
-
-                    res = db_session.execute(
-                        update(Card)
-                        .where(Card.name == name, Card.born == born, Card.mlb_id.is_(None))
-                        .values(mlb_id=mlb_id)
-                    )
-                    updated_rows = int(res.rowcount or 0)
-                    linked_cards += updated_rows
+                    self._card_link_buf.append((name, born, mlb_id))
 
                     self.logger.info(
-                        f"[SUCCESS] name='{name}' born='{born}' -> mlb='{person.get('fullName')}' "
-                        f"(mlb_id={mlb_id}) cards_linked={updated_rows} two_way={profile['two_way_mode']}"
+                        "[SUCCESS] name='%s' born='%s' -> mlb='%s' (mlb_id=%s) two_way=%s",
+                        name, born, person.get("fullName"), mlb_id, profile["two_way_mode"],
                     )
 
+                    if self._buffers_full():
+                        linked_cards += self._flush_buffers(db_session)
+
                     if processed % self.flush_every == 0:
                         db_session.flush()
                         self.logger.info(
@@ -119,7 +288,7 @@ class PlayerSync(BaseJob):
                             f"linked_cards={linked_cards}, no_results={no_results}, no_match={no_match}, skipped={skipped}"
                         )
 
-            for (raw_name, raw_born) in rows:
+            for (raw_name, raw_born) in pairs:
                 processed += 1
 
                 name = (raw_name or "").strip()
@@ -128,35 +297,28 @@ class PlayerSync(BaseJob):
                     skipped += 1
                     continue
 
-                group_key = (self._norm_name(name), self._norm(born))
+                group_key = (_norm_name(name), _norm(born))
                 if group_key in self._group_cache:
                     cached = self._group_cache[group_key]
                     if cached is None:
                         skipped += 1
                     else:
-                        profile = cached["_profile"]
                         mlb_id = cached.get("id")
                         if mlb_id is None:
                             skipped += 1
                             continue
                         mlb_id = int(mlb_id)
 
-                        if self._upsert_player(db_session, cached):
-                            upserted_players += 1
-                        db_session.flush()
-
-                        res = db_session.execute(
-                            update(Card)
-                            .where(Card.name == name, Card.born == born, Card.mlb_id.is_(None))
-                            .values(mlb_id=mlb_id)
-                        )
-                        linked_cards += int(res.rowcount or 0)
+                        # The player row was already queued when this group first matched
+                        self._card_link_buf.append((name, born, mlb_id))
+                        if self._buffers_full():
+                            linked_cards += self._flush_buffers(db_session)
 
                     if processed % self.flush_every == 0:
                         db_session.flush()
                     continue
 
-                profile = self._load_card_profile(db_session, name, born)
+                profile = self._load_card_profile(name, born)
                 fut = pool.submit(self._search_people_worker, name)
                 pending[fut] = (name, born, profile, group_key)
 
@@ -168,18 +330,58 @@ class PlayerSync(BaseJob):
                 done, _ = wait(pending.keys(), return_when=FIRST_COMPLETED)
                 drain(done)
 
+        linked_cards += self._flush_buffers(db_session)
         db_session.flush()
         self.logger.info(
             f"Done. processed={processed}, upserted_players={upserted_players}, linked_cards={linked_cards}, "
             f"no_results={no_results}, no_match={no_match}, skipped={skipped}"
         )
 
+        # Caps memory between runs in a long-lived scheduler process
+        _norm.cache_clear()
+        _norm_name.cache_clear()
+
+    def _prewarm_group_cache(self, session) -> None:
+        """Seeds _group_cache from cards already linked to a player.
+
+        A new card for a known player shares its (name, born) group with the linked ones, so it can be linked
+        without a people/search call. Groups linked to more than one mlb_id are left for the search to decide.
+        """
+        ids_by_group: Dict[Tuple[str, str], Set[int]] = {}
+        linked = select(Card.name, Card.born, Card.mlb_id).where(Card.mlb_id.is_not(None)).distinct()
+        for name, born, mlb_id in session.execute(linked):
+            group_key = (_norm_name((name or "").strip()), _norm((born or "").strip()))
+            ids_by_group.setdefault(group_key, set()).add(int(mlb_id))
+
+        seeded = 0
+        for group_key, ids in ids_by_group.items():
+            if len(ids) == 1 and group_key not in self._group_cache:
+                self._group_cache[group_key] = {"id": next(iter(ids))}
+                seeded += 1
+
+        self.logger.info(f"Pre-warmed group cache with {seeded} linked (name, born) groups")
+
     def _search_people_worker(self, name: str) -> List[Dict[str, Any]]:
-        time.sleep(random.uniform(*JITTER_RANGE_S))
-        client = APIClient()
+        # Shared job client: its session pools keep-alive connections across all search workers
+        client = self.api_client
         url = "https://statsapi.mlb.com/api/v1/people/search"
         params = {"names": [name], "limit": 10, "accent": False}
-        res = client.get(url, params)
+
+        for attempt in range(SEARCH_ATTEMPTS):
+            self._rate_limiter.acquire()
+            try:
+                res = client.get(url, params)
+                break
+            except requests.exceptions.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt + 1 >= SEARCH_ATTEMPTS:
+                    self.logger.warning(f"people/search failed for name='{name}' after {attempt + 1} attempt(s): {e}")
+                    raise
+
+                # Full jitter: spreads retries out instead of having every worker come back together
+                time.sleep(random.uniform(0, min(RETRY_CAP_S, RETRY_BASE_S * (2 ** attempt))))
+
         people = self._json_get(res, "people", default=[]) or []
         return people
 
@@ -190,31 +392,32 @@ class PlayerSync(BaseJob):
         profile: Dict[str, Any],
         scored: List[Tuple[int, Dict[str, Any]]],
     ) -> Optional[Dict[str, Any]]:
-        two_way_mode = bool(profile["two_way_mode"])
-        name_norm = self._norm_name(name)
-
-        if not two_way_mode:
-            role_filtered = [(s, p) for (s, p) in scored if s > -10_000]
-            if not role_filtered:
-                return None
+        best_score, best_person = max(scored, key=_score_key)
+        if best_score <= -10_000:
+            return None
 
+        if not bool(profile["two_way_mode"]):
+            name_norm = _norm_name(name)
             exact_role = [
-                (s, p) for (s, p) in role_filtered
-                if self._norm_name(p.get("fullName") or "") == name_norm
+                (s, p) for (s, p) in scored
+                if s > -10_000 and self._candidate_sig(p)["full"] == name_norm
             ]
             if exact_role:
-                return exact_role[0][1]
-            return role_filtered[0][1]
+                return max(exact_role, key=_score_key)[1]
 
-        if scored[0][0] <= -10_000:
-            return None
-        return scored[0][1]
+        return best_person
+
+    def _load_card_profile_rows(self, session, groups) -> None:
+        """Loads is_hitter/height/weight of every card in the given (name, born) groups with one query."""
+        stmt = select(Card.name, Card.born, Card.is_hitter, Card.height, Card.weight).where(
+            tuple_(Card.name, Card.born).in_(groups)
+        )
+        self._profile_rows = {}
+        for name, born, is_hitter, height, weight in session.execute(stmt):
+            self._profile_rows.setdefault((name, born), []).append((is_hitter, height, weight))
 
-    def _load_card_profile(self, session, name: str, born: str) -> Dict[str, Any]:
-        rows = session.execute(
-            select(Card.is_hitter, Card.height, Card.weight, Card.born)
-            .where(Card.name == name, Card.born == born)
-        ).all()
+    def _load_card_profile(self, name: str, born: str) -> Dict[str, Any]:
+        rows = self._profile_rows.get((name, born), ())
 
         has_hitter = any(bool(r[0]) for r in rows if r[0] is not None)
         has_pitcher = any((r[0] is not None) and (not bool(r[0])) for r in rows)
@@ -223,9 +426,9 @@ class PlayerSync(BaseJob):
         heights: List[int] = []
         weights: List[int] = []
 
-        for _, h, w, _b in rows:
-            hi = self._height_to_inches(h)
-            wi = self._weight_to_lbs(w)
+        for _, h, w in rows:
+            hi = _height_to_inches(h)
+            wi = _weight_to_lbs(w)
             if hi is not None:
                 heights.append(hi)
             if wi is not None:
@@ -244,7 +447,7 @@ class PlayerSync(BaseJob):
         return {
             "name": name,
             "born": born,
-            "born_norm": self._norm(born),
+            "born_norm": _norm(born),
             "two_way_mode": two_way_mode,
             "expected_is_hitter": expected_is_hitter,
             "card_height_in": height_in,
@@ -260,10 +463,11 @@ class PlayerSync(BaseJob):
         return [(self._score_candidate(query_name, p, profile), p) for p in people]
 
     def _score_candidate(self, query_name: str, p: Dict[str, Any], profile: Dict[str, Any]) -> int:
-        q = self._norm_name(query_name)
-        full = self._norm_name(p.get("fullName") or "")
-        first = self._norm(p.get("firstName") or "")
-        last = self._norm(p.get("lastName") or "")
+        sig = self._candidate_sig(p)
+        q = _norm_name(query_name)
+        full = sig["full"]
+        first = sig["first"]
+        last = sig["last"]
 
         if not full:
             return -10_000
@@ -297,20 +501,36 @@ class PlayerSync(BaseJob):
                 return -10_000
             score += 25
 
-        score += self._born_score(profile.get("born_norm") or "", p)
-        score += self._body_score(profile.get("card_height_in"), profile.get("card_weight_lb"), p)
+        score += self._born_score(profile.get("born_norm") or "", sig)
+        score += self._body_score(profile.get("card_height_in"), profile.get("card_weight_lb"), sig)
 
         return score
 
-    def _born_score(self, card_born_norm: str, p: Dict[str, Any]) -> int:
+    def _candidate_sig(self, p: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalized fields scoring reads from a candidate, computed once per person dict."""
+        sig = p.get("_sig")
+        if sig is None:
+            born_parts = (
+                _norm(p.get("birthCity") or ""),
+                _norm(p.get("birthStateProvince") or ""),
+                _norm(p.get("birthCountry") or ""),
+            )
+            sig = {
+                "full": _norm_name(p.get("fullName") or ""),
+                "first": _norm(p.get("firstName") or ""),
+                "last": _norm(p.get("lastName") or ""),
+                "born_tokens": tuple(t for t in born_parts if t),
+                "h_in": _height_to_inches(p.get("height")),
+                "w_lb": _weight_to_lbs(p.get("weight")),
+            }
+            p["_sig"] = sig
+        return sig
+
+    def _born_score(self, card_born_norm: str, sig: Dict[str, Any]) -> int:
         if not card_born_norm:
             return 0
 
-        city = self._norm(p.get("birthCity") or "")
-        state = self._norm(p.get("birthStateProvince") or "")
-        country = self._norm(p.get("birthCountry") or "")
-
-        tokens = [t for t in (city, state, country) if t]
+        tokens = sig["born_tokens"]
         if not tokens:
             return 0
 
@@ -323,9 +543,9 @@ class PlayerSync(BaseJob):
             return 8
         return 0
 
-    def _body_score(self, card_height_in: Optional[int], card_weight_lb: Optional[int], p: Dict[str, Any]) -> int:
-        api_height_in = self._height_to_inches(p.get("height"))
-        api_weight_lb = self._weight_to_lbs(p.get("weight"))
+    def _body_score(self, card_height_in: Optional[int], card_weight_lb: Optional[int], sig: Dict[str, Any]) -> int:
+        api_height_in = sig["h_in"]
+        api_weight_lb = sig["w_lb"]
 
         score = 0
 
@@ -394,24 +614,19 @@ class PlayerSync(BaseJob):
         strike_zone_top = person.get("strikeZoneTop")
         strike_zone_bottom = person.get("strikeZoneBottom")
 
-        existing = session.get(Player, mlb_id)
-        is_new = existing is None
+        weight = person.get("weight")
 
-        player = Player(
+        row = {col: (person.get(src) or "") for col, src in _PLAYER_TEXT_FIELDS}
+        row.update(
             mlb_id=mlb_id,
-            full_name=(person.get("fullName") or ""),
-            first_name=(person.get("firstName") or ""),
-            last_name=(person.get("lastName") or ""),
-            number=(person.get("primaryNumber") or ""),
             birth_date=birth_date,
             current_age=int(person.get("currentAge") or 0),
             birth_location_id=birth_location_id,
             height=person.get("height"),
-            weight=str(person.get("weight")) if person.get("weight") is not None else None,
+            weight=str(weight) if weight is not None else None,
             active=bool(person.get("active") or False),
             current_team_id=None,
             position_id=position_id,
-            boxscore_name=(person.get("boxscoreName") or ""),
             draft_year=person.get("draftYear"),
             mlb_debut_date=self._parse_date(person.get("mlbDebutDate")),
             bat_side_code=(bat_side.get("code") or ""),
@@ -420,15 +635,36 @@ class PlayerSync(BaseJob):
             strike_zone_bottom=str(strike_zone_bottom) if strike_zone_bottom is not None else "",
         )
 
-        session.merge(player)
-
-        if is_new:
-            self.logger.info(f"[PLAYER_UPSERT][CREATED] mlb_id={mlb_id} name='{player.full_name}'")
-        else:
-            self.logger.info(f"[PLAYER_UPSERT][UPDATED] mlb_id={mlb_id} name='{player.full_name}'")
+        self._player_buf[mlb_id] = row
+        self.logger.info("[PLAYER_UPSERT][QUEUED] mlb_id=%s name='%s'", mlb_id, row["full_name"])
 
         return True
 
+    def _buffers_full(self) -> bool:
+        return len(self._player_buf) >= PLAYER_UPSERT_BATCH or len(self._card_link_buf) >= PLAYER_UPSERT_BATCH
+
+    def _flush_buffers(self, session) -> int:
+        """Writes queued players and card links; returns the number of cards linked."""
+        linked = 0
+
+        if self._player_buf:
+            # Pending positions / birth locations must reach the DB before the players referencing them
+            session.flush()
+            session.execute(_PLAYER_UPSERT, list(self._player_buf.values()))
+            self._player_buf.clear()
+
+        if self._card_link_buf:
+            cursor = session.connection().connection.cursor()
+            try:
+                # One page, so rowcount covers the whole batch
+                execute_values(cursor, _CARD_LINK_SQL, self._card_link_buf, page_size=len(self._card_link_buf))
+                linked = int(cursor.rowcount or 0)
+            finally:
+                cursor.close()
+            self._card_link_buf.clear()
+
+        return linked
+
     def _upsert_position(self, session, pos: Dict[str, Any]) -> int:
         code = (pos.get("code") or "").strip()
         if not code:
@@ -437,12 +673,15 @@ class PlayerSync(BaseJob):
         pos_id = int(code) if code.isdigit() else 0
         if pos_id == 0:
             return 0
+        if pos_id in self._positions_seen:
+            return pos_id
 
         name = (pos.get("name") or "").strip() or str(pos_id)
         abbr = (pos.get("abbreviation") or "").strip()
 
+        # Left pending; _flush_buffers flushes before the player rows that reference it are written
         session.merge(MLBPosition(id=pos_id, name=name, abbreviation=abbr))
-        session.flush()
+        self._positions_seen.add(pos_id)
         return pos_id
 
     def _ensure_unknown_position(self, session) -> None:
@@ -460,23 +699,18 @@ class PlayerSync(BaseJob):
         if not city or not country:
             return None
 
-        stmt = select(BirthLocation).where(
-            BirthLocation.city == city,
-            BirthLocation.country == country,
-        )
-        if state is None:
-            stmt = stmt.where(BirthLocation.state_province.is_(None))
-        else:
-            stmt = stmt.where(BirthLocation.state_province == state)
+        key = (city, state, country)
+        if key in self._birthloc_cache:
+            return self._birthloc_cache[key]
 
-        existing = session.execute(stmt).scalars().first()
-        if existing:
-            return existing.id
+        params = {"city": city, "state_province": state, "country": country}
+        # Inserts on a miss; only when the row already exists does the follow-up SELECT run
+        loc_id = session.execute(_BIRTH_LOC_INSERT, params).scalar_one_or_none()
+        if loc_id is None:
+            loc_id = session.execute(_BIRTH_LOC_SELECT, params).scalar_one()
 
-        loc = BirthLocation(city=city, state_province=state, country=country)
-        session.add(loc)
-        session.flush()
-        return loc.id
+        self._birthloc_cache[key] = loc_id
+        return loc_id
 
     def _parse_date(self, value: Any) -> Optional[datetime.date]:
         if not value:
@@ -487,59 +721,3 @@ class PlayerSync(BaseJob):
             return datetime.date.fromisoformat(str(value))
         except Exception:
             return None
-
-    def _norm(self, s: str) -> str:
-        if not s:
-            return ""
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join(ch for ch in s if not unicodedata.combining(ch))
-        s = s.lower().strip()
-        s = re.sub(r"[^\w\s]", " ", s)
-        s = re.sub(r"\s+", " ", s).strip()
-        return s
-
-    def _norm_name(self, s: str) -> str:
-        base = self._norm(s)
-        if not base:
-            return ""
-
-        tokens = base.split()
-        joined: List[str] = []
-        i = 0
-        while i < len(tokens):
-            if len(tokens[i]) == 1:
-                j = i
-                buf = []
-                while j < len(tokens) and len(tokens[j]) == 1:
-                    buf.append(tokens[j])
-                    j += 1
-                if len(buf) >= 2:
-                    joined.append("".join(buf))
-                else:
-                    joined.append(buf[0])
-                i = j
-            else:
-                joined.append(tokens[i])
-                i += 1
-
-        return " ".join(joined)
-
-    def _height_to_inches(self, h: Any) -> Optional[int]:
-        if not h:
-            return None
-        s = str(h).strip()
-        m = re.search(r"(\d+)\s*'\s*(\d+)", s)
-        if not m:
-            return None
-        ft = int(m.group(1))
-        inch = int(m.group(2))
-        return ft * 12 + inch
-
-    def _weight_to_lbs(self, w: Any) -> Optional[int]:
-        if w is None or w == "":
-            return None
-        if isinstance(w, (int, float)):
-            return int(w)
-        s = str(w).strip().lower()
-        m = re.search(r"(\d+)", s)
-        return int(m.group(1)) if m else None
@@ -1,12 +1,25 @@
 from datetime import datetime
 from src.jobs.base import BaseJob
 from src.core.config import THE_SHOW_YEARS, MAJOR_ROSTER_UPDATES, FIELDING_ROSTER_UPDATES
-from typing import Dict
+from typing import Any, Dict, List
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 import time
 
 from src.database.models import RosterUpdate, CardUpdate, CardAttributeChange
 
+_CARD_UPDATE_PK = ("update_id", "update_date", "card_id")
+_CARD_UPDATE_INSERT = pg_insert(CardUpdate)
+_CARD_UPDATE_UPSERT = _CARD_UPDATE_INSERT.on_conflict_do_update(
+    index_elements=list(_CARD_UPDATE_PK),
+    set_={
+        c.name: _CARD_UPDATE_INSERT.excluded[c.name]
+        for c in CardUpdate.__table__.columns
+        if c.name not in _CARD_UPDATE_PK
+    },
+)
+
 
 class RosterUpdateSync(BaseJob):
     def __init__(self, reload_all_years: bool = False):
@@ -89,6 +102,10 @@ class RosterUpdateSync(BaseJob):
             self.logger.info(f"No attribute changes found for update {update_id}")
             return
 
+        # Keyed by card so a card repeated in the payload keeps only its last entry, as merge() did
+        card_updates: Dict[str, Dict[str, Any]] = {}
+        attr_changes: Dict[str, List[Dict[str, Any]]] = {}
+
         for item in attribute_changes:
             card_data = self._json_get(item, "item", {})
             source_uuid = self._json_get(card_data, "uuid", "")
@@ -97,19 +114,19 @@ class RosterUpdateSync(BaseJob):
 
             card_id = self._card_id(year, source_uuid)
 
-            card_update = CardUpdate(
-                update_id=update_id,
-                update_date=update_date,
-                card_id=card_id,
-                new_ovr=self._json_get(item, "current_rank", 0),
-                old_ovr=self._json_get(item, "old_rank", 0),
-                new_rarity=self._json_get(item, "current_rarity", ""),
-                old_rarity=self._json_get(item, "old_rarity", ""),
-                trend_display=self._json_get(item, "trend_display", ""),
-            )
+            card_updates[card_id] = {
+                "update_id": update_id,
+                "update_date": update_date,
+                "card_id": card_id,
+                "new_ovr": self._json_get(item, "current_rank", 0),
+                "old_ovr": self._json_get(item, "old_rank", 0),
+                "new_rarity": self._json_get(item, "current_rarity", ""),
+                "old_rarity": self._json_get(item, "old_rarity", ""),
+                "trend_display": self._json_get(item, "trend_display", ""),
+            }
 
             changes_list = self._json_get(item, "changes", []) or []
-            attr_change_objects = []
+            change_rows = []
 
             for change in changes_list:
                 current_val_str = self._json_get(change, "current_value", "0")
@@ -123,24 +140,39 @@ class RosterUpdateSync(BaseJob):
                     current_val = 0
                     old_val = 0
 
-                attr_change_objects.append(
-                    CardAttributeChange(
-                        update_id=update_id,
-                        update_date=update_date,
-                        card_id=card_id,
-                        name=self._json_get(change, "name", ""),
-                        new_value=current_val,
-                        old_value=old_val,
-                        direction=self._json_get(change, "direction", ""),
-                        delta=delta_str,
-                        color=self._json_get(change, "color", ""),
-                    )
+                change_rows.append(
+                    {
+                        "update_id": update_id,
+                        "update_date": update_date,
+                        "card_id": card_id,
+                        "name": self._json_get(change, "name", ""),
+                        "new_value": current_val,
+                        "old_value": old_val,
+                        "direction": self._json_get(change, "direction", ""),
+                        "delta": delta_str,
+                        "color": self._json_get(change, "color", ""),
+                    }
                 )
 
-            card_update.attribute_changes = attr_change_objects
-            session.merge(card_update)
+            attr_changes[card_id] = change_rows
+
+        if not card_updates:
+            return
+
+        child_rows = [row for rows in attr_changes.values() for row in rows]
 
         try:
+            session.execute(_CARD_UPDATE_UPSERT, list(card_updates.values()))
+            # Replaces each card's previous attribute changes, matching the old delete-orphan cascade
+            session.execute(
+                delete(CardAttributeChange).where(
+                    CardAttributeChange.update_id == update_id,
+                    CardAttributeChange.update_date == update_date,
+                    CardAttributeChange.card_id.in_(list(card_updates)),
+                )
+            )
+            if child_rows:
+                session.execute(insert(CardAttributeChange), child_rows)
             session.commit()
         except Exception as e:
             self.logger.error(f"Failed to commit update {update_id}: {e}")
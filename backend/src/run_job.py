@@ -1,12 +1,9 @@
 from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 import argparse
+import logging
 
-from src.database.database import SessionLocal
-
-from src.jobs.market_sync import MarketSync
-from src.jobs.card_sync import CardSync
-from src.jobs.market_candle_sync import MarketCandleSync
-from src.jobs.roster_update_sync import RosterUpdateSync
+logger = logging.getLogger(__name__)
 
 
 def try_lock(session, name: str) -> bool:
@@ -25,32 +22,54 @@ def unlock(session, name: str) -> None:
     )
 
 
-def main() -> None:
-    p = argparse.ArgumentParser()
-    p.add_argument(
-        "job",
-        choices=["market_sync", "card_sync", "market_candle_sync", "roster_update_sync"],
-    )
-    p.add_argument("--reload-all-years", action="store_true")
-    args = p.parse_args()
+JOB_KEYS = ["market_sync", "card_sync", "market_candle_sync", "roster_update_sync"]
+
 
-    job_key = args.job
+def run_job(job_key: str, reload_all_years: bool = False) -> None:
+    # Imported here so an invocation only pays for the engine and the one job module it runs
+    from src.database.database import SessionLocal
 
     with SessionLocal() as session:
         if not try_lock(session, job_key):
+            logger.warning(f"Skipping {job_key}: another run holds its lock")
             return
 
         try:
             if job_key == "market_sync":
+                from src.jobs.market_sync import MarketSync
                 MarketSync().execute(session)
             elif job_key == "card_sync":
-                CardSync(reload_all_years=args.reload_all_years).execute(session)
+                from src.jobs.card_sync import CardSync
+                CardSync(reload_all_years=reload_all_years).execute(session)
             elif job_key == "market_candle_sync":
+                from src.jobs.market_candle_sync import MarketCandleSync
                 MarketCandleSync().execute(session)
             elif job_key == "roster_update_sync":
-                RosterUpdateSync(reload_all_years=args.reload_all_years).execute(session)
+                from src.jobs.roster_update_sync import RosterUpdateSync
+                RosterUpdateSync(reload_all_years=reload_all_years).execute(session)
+            session.commit()
+        except Exception:
+            # The advisory lock is session-level: it survives this rollback, but unlock can't run on an
+            # aborted transaction
+            session.rollback()
+            raise
         finally:
-            unlock(session, job_key)
+            try:
+                unlock(session, job_key)
+            except SQLAlchemyError:
+                # Under the scheduler the connection goes back to the pool still holding the lock and the job
+                # would never run again; dropping the connection is the only other way to release it
+                logger.error(f"Failed to release lock for {job_key}; discarding its connection", exc_info=True)
+                session.invalidate()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser()
+    p.add_argument("job", choices=JOB_KEYS)
+    p.add_argument("--reload-all-years", action="store_true")
+    args = p.parse_args()
+
+    run_job(args.job, reload_all_years=args.reload_all_years)
 
 
 if __name__ == "__main__":
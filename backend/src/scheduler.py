@@ -0,0 +1,43 @@
+import logging
+import sys
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from src.run_job import run_job
+
+TIMEZONE = "America/Vancouver"
+
+# job key -> cron fields (same times the supercronic crontab used)
+SCHEDULE = {
+    "market_sync": {"minute": "*/10"},
+    "card_sync": {"minute": 0, "hour": "3,15"},
+    "market_candle_sync": {"minute": 1, "hour": 0},
+    "roster_update_sync": {"minute": 0, "hour": 15, "day_of_week": "fri,sat,sun"},
+}
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
+    # One resident process: the interpreter, job modules and engine pool are set up once instead of on every tick.
+    # max_instances=1 replaces flock; run_job still takes the advisory lock against manual one-shot runs.
+    scheduler = BlockingScheduler(
+        timezone=TIMEZONE,
+        job_defaults={"max_instances": 1, "coalesce": True, "misfire_grace_time": 60},
+    )
+    for job_key, fields in SCHEDULE.items():
+        scheduler.add_job(run_job, CronTrigger(timezone=TIMEZONE, **fields), args=[job_key], id=job_key)
+
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+
+
+if __name__ == "__main__":
+    main()
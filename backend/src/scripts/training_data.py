@@ -1,4 +1,6 @@
-import re
+import gc
+import io
+import numpy as np
 import pandas as pd
 from datetime import timedelta
 from sqlalchemy import text
@@ -6,19 +8,51 @@ from src.database.database import engine
 
 OUTPUT_PATH = "src/training_data.csv"
 
-def height_to_inches(v):
-    if not isinstance(v, str): return None
-    m = re.match(r"(\d+)'\s*(\d+)", v)
-    return int(m.group(1)) * 12 + int(m.group(2)) if m else None
+# Stats are only read for players that some updated card is linked to
+CARD_UPDATE_PLAYERS = """
+    SELECT c.mlb_id
+    FROM card_updates cu
+    JOIN cards c ON c.id = cu.card_id
+"""
 
-def weight_to_lbs(v):
-    if not isinstance(v, str): return None
-    val = re.sub(r"[^\d]", "", v)
-    return int(val) if val else None
+ID_COLS = ("player_id", "season")
+BATTING_TOTAL_SPLITS = ["vslhp", "vsrhp"]
+PITCHING_TOTAL_SPLITS = ["vslhb", "vsrhb"]
+
+def whole_numbers(s):
+    """Matches the dtype a per-row int-or-None parse would infer, so the CSV is unchanged."""
+    if s.isna().all():
+        return s.astype(object)
+    return s.astype("int64") if s.notna().all() else s
+
+def height_to_inches(heights):
+    parts = heights.str.extract(r"^(\d+)'\s*(\d+)").astype(float)
+    return whole_numbers(parts[0] * 12 + parts[1])
+
+def weight_to_lbs(weights):
+    digits = weights.str.replace(r"\D", "", regex=True).replace("", np.nan)
+    return whole_numbers(pd.to_numeric(digits))
 
 def safe_div(n, d):
     return n / d if d and d != 0 else 0.0
 
+def read_copy(q, parse_dates):
+    """Reads a query through COPY so pandas' C parser builds the columns instead of per-row tuples."""
+    buf = io.StringIO()
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        try:
+            cursor.copy_expert(f"COPY ({q}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')", buf)
+        finally:
+            cursor.close()
+    finally:
+        conn.close()
+
+    buf.seek(0)
+    return pd.read_csv(buf, parse_dates=parse_dates, dtype={"split": str},
+                       na_values=["\\N"], keep_default_na=False)
+
 def make_naive(df, col):
     """Removes timezone info from a datetime column to prevent comparison errors."""
     if col in df.columns and pd.api.types.is_datetime64_any_dtype(df[col]):
@@ -65,60 +99,133 @@ def load_attribute_changes():
     return df
 
 def load_batting():
-    df = pd.read_sql(text("""
+    df = read_copy(f"""
         SELECT b.player_id, g.game_date, g.season, b.split,
                b.pa, b.r, b.h, b.doubles, b.triples, b.hr, 
                b.hbp, b.tb, b.rbi, b.so, b.bb, b.ab, b.lob
         FROM mlb_game_batting_stats b
         JOIN mlb_games g ON g.id = b.game_id
-    """), engine, parse_dates=["game_date"])
+        WHERE b.player_id IN ({CARD_UPDATE_PLAYERS})
+    """, parse_dates=["game_date"])
     
     df["player_id"] = df["player_id"].fillna(0).astype(int)
     df["season"] = df["season"].fillna(0).astype(int)
     df = make_naive(df, "game_date")
-    return df
+    return downcast_counts(df)
 
 def load_pitching():
-    df = pd.read_sql(text("""
+    df = read_copy(f"""
         SELECT p.player_id, g.game_date, g.season, p.split,
                p.outs_pitched, p.ip, p.ab, p.pitches_thrown,
                p.h, p.doubles, p.triples, p.hr, p.bb, p.k, 
                p.r, p.er, p.batters_faced, p.balls_thrown, p.strikes_thrown
         FROM mlb_game_pitching_stats p
         JOIN mlb_games g ON g.id = p.game_id
-    """), engine, parse_dates=["game_date"])
+        WHERE p.player_id IN ({CARD_UPDATE_PLAYERS})
+    """, parse_dates=["game_date"])
     
     df["player_id"] = df["player_id"].fillna(0).astype(int)
     df["season"] = df["season"].fillna(0).astype(int)
     df = make_naive(df, "game_date")
-    return df
+    return downcast_counts(df)
 
 def load_baserunning():
-    df = pd.read_sql(text("""
+    df = read_copy(f"""
         SELECT b.player_id, g.game_date, g.season, 
                b.sb, b.caught_stealing
         FROM mlb_game_baserunning_stats b
         JOIN mlb_games g ON g.id = b.game_id
-    """), engine, parse_dates=["game_date"])
+        WHERE b.player_id IN ({CARD_UPDATE_PLAYERS})
+    """, parse_dates=["game_date"])
     
     df["player_id"] = df["player_id"].fillna(0).astype(int)
     df["season"] = df["season"].fillna(0).astype(int)
     df = make_naive(df, "game_date")
-    return df
+    return downcast_counts(df)
 
 def load_fielding():
-    df = pd.read_sql(text("""
+    df = read_copy(f"""
         SELECT f.player_id, g.game_date, g.season,
                f.assists, f.put_outs, f.errors, f.chances
         FROM mlb_game_fielding_stats f
         JOIN mlb_games g ON g.id = f.game_id
-    """), engine, parse_dates=["game_date"])
+        WHERE f.player_id IN ({CARD_UPDATE_PLAYERS})
+    """, parse_dates=["game_date"])
     
     df["player_id"] = df["player_id"].fillna(0).astype(int)
     df["season"] = df["season"].fillna(0).astype(int)
     df = make_naive(df, "game_date")
+    return downcast_counts(df)
+
+
+def clean_split(s):
+    return str(s).lower().replace(" ", "")
+
+def stat_columns(df):
+    """Columns that df.sum(numeric_only=True) totals, minus the id columns."""
+    return [c for c in df.columns if c not in ID_COLS and pd.api.types.is_numeric_dtype(df[c])]
+
+def downcast_counts(df):
+    """Stores integer stat columns in the smallest int type that fits; range_table widens them back to sum."""
+    for c in stat_columns(df):
+        if pd.api.types.is_integer_dtype(df[c]):
+            df[c] = pd.to_numeric(df[c], downcast="integer")
     return df
 
+def range_table(g, cols, total_splits):
+    """Date-sorted games of one player (or player-season) with cumulative stat sums.
+
+    One group per total/split, each holding running sums prefixed with 0, so the stats of games [lo, hi) are
+    cum[hi] - cum[lo]. With total_splits set (batting/pitching), the total only counts those splits and every
+    split present gets its own group, in the order df.groupby("split") would produce; otherwise the total
+    covers every game.
+    """
+    g = g.sort_values("game_date", kind="stable")
+    dates = g["game_date"].to_numpy(dtype="datetime64[ns]")
+    # DataFrame.sum returns one Series, so every total shares the columns' common dtype (float once any
+    # column holds NULLs); running sums use that dtype for the same values
+    sum_dtype = np.result_type(np.int64, *(g[c].dtype for c in cols))
+    values = [g[c].fillna(0).to_numpy(dtype=sum_dtype) for c in cols]
+
+    if total_splits is None:
+        masks = [(None, np.ones(len(g), dtype=bool))]
+    else:
+        split = g["split"]
+        masks = [(None, split.map(clean_split).isin(total_splits).to_numpy())]
+        masks += [(name, (split == name).to_numpy()) for name in sorted(split.dropna().unique())]
+
+    groups = []
+    for name, mask in masks:
+        cum = {}
+        for c, v in zip(cols, values):
+            cum[c] = np.concatenate((np.zeros(1, dtype=sum_dtype), np.cumsum(np.where(mask, v, 0), dtype=sum_dtype)))
+        count = np.concatenate(([0], np.cumsum(mask)))
+        groups.append((name, count, cum))
+    return dates, groups
+
+def build_range_tables(df, keys, total_splits=None):
+    cols = stat_columns(df)
+    df = df[df["game_date"].notna()]
+    tables = {k: range_table(g, cols, total_splits) for k, g in df.groupby(keys, sort=False)}
+    return tables, range_table(df.iloc[:0], cols, total_splits)
+
+def range_sums(table, start=None, start_side="left", end=None, end_side="left"):
+    """Stat totals of the games dated within [start, end) of a range table (sides as in np.searchsorted).
+
+    Returns (total, [(split, sums), ...]) with only the splits that have games in range.
+    """
+    dates, groups = table
+    lo = 0 if start is None else int(np.searchsorted(dates, start, side=start_side))
+    hi = max(lo, int(np.searchsorted(dates, end, side=end_side)))
+
+    _, _, total_cum = groups[0]
+    total = {c: cum[hi] - cum[lo] for c, cum in total_cum.items()}
+    splits = [
+        (name, {c: cum[hi] - cum[lo] for c, cum in cum_by_col.items()})
+        for name, count, cum_by_col in groups[1:]
+        if count[hi] > count[lo]
+    ]
+    return total, splits
 
 def calc_batting_metrics(s, prefix):
     ab = s.get("ab", 0)
@@ -140,26 +247,11 @@ def calc_batting_metrics(s, prefix):
     out[f"{prefix}k_pct"] = safe_div(so, ab)
     return out
 
-def agg_batting(df, prefix):
-    def clean_split(s):
-        return str(s).lower().replace(" ", "")
-
-    if not df.empty and "split" in df.columns:
-        splits_clean = df["split"].apply(clean_split)
-        
-        total_mask = splits_clean.isin(["vslhp", "vsrhp"])
-        total_sum = df[total_mask].sum(numeric_only=True).to_dict()
-    else:
-        total_sum = df.sum(numeric_only=True).to_dict()
-
+def agg_batting(sums, prefix):
+    total_sum, split_sums = sums
     out = calc_batting_metrics(total_sum, prefix)
-
-    if not df.empty and "split" in df.columns:
-        for split_name, gdf in df.groupby("split"):
-            s_clean = clean_split(split_name)
-            split_prefix = f"{prefix}{s_clean}_"
-            split_sum = gdf.sum(numeric_only=True).to_dict()
-            out.update(calc_batting_metrics(split_sum, split_prefix))
+    for split_name, split_sum in split_sums:
+        out.update(calc_batting_metrics(split_sum, f"{prefix}{clean_split(split_name)}_"))
     return out
 
 def calc_pitching_metrics(s, prefix):
@@ -193,30 +285,15 @@ def calc_pitching_metrics(s, prefix):
     
     return out
 
-def agg_pitching(df, prefix):
-    def clean_split(s):
-        return str(s).lower().replace(" ", "")
-
-    if not df.empty and "split" in df.columns:
-        splits_clean = df["split"].apply(clean_split)
-        
-        total_mask = splits_clean.isin(["vslhb", "vsrhb"])
-        total_sum = df[total_mask].sum(numeric_only=True).to_dict()
-    else:
-        total_sum = df.sum(numeric_only=True).to_dict()
-
+def agg_pitching(sums, prefix):
+    total_sum, split_sums = sums
     out = calc_pitching_metrics(total_sum, prefix)
-
-    if not df.empty and "split" in df.columns:
-        for split_name, gdf in df.groupby("split"):
-            s_clean = clean_split(split_name)
-            split_prefix = f"{prefix}{s_clean}_"
-            split_sum = gdf.sum(numeric_only=True).to_dict()
-            out.update(calc_pitching_metrics(split_sum, split_prefix))
+    for split_name, split_sum in split_sums:
+        out.update(calc_pitching_metrics(split_sum, f"{prefix}{clean_split(split_name)}_"))
     return out
 
-def agg_baserunning(df, prefix):
-    s = df.sum(numeric_only=True).to_dict()
+def agg_baserunning(sums, prefix):
+    s = sums[0]
     sb = s.get("sb", 0)
     cs = s.get("caught_stealing", 0)
     out = {
@@ -227,8 +304,8 @@ def agg_baserunning(df, prefix):
     }
     return out
 
-def agg_fielding(df, prefix):
-    s = df.sum(numeric_only=True).to_dict()
+def agg_fielding(sums, prefix):
+    s = sums[0]
     errors = s.get("errors", 0)
     chances = s.get("chances", 0)
     out = {
@@ -274,87 +351,131 @@ def main():
         # Fill newly created attribute columns with 0
         new_cols = [c for c in attr_pivot.columns if c not in ["update_id", "update_date", "card_id"]]
         base[new_cols] = base[new_cols].fillna(0)
+        del attr_pivot
+    del attr_changes
     # --- End: Merge Attribute Changes ---
 
-    rows = []
+    # Output accumulated column-wise: one list per feature in first-seen order, padded with None where a row
+    # lacks the key (e.g. a split with no games in a scope), which is what DataFrame(list_of_dicts) would infer
+    columns = {}
+    n_rows = 0
     
-    relevant_ids = set(base["mlb_id"].unique())
-    batting = batting[batting["player_id"].isin(relevant_ids)]
-    pitching = pitching[pitching["player_id"].isin(relevant_ids)]
+    # Cumulative per-player (and per-player-season) stat tables, built once; every scope of every update is then
+    # a pair of binary searches and a subtraction instead of filtering and summing DataFrames
+    batting_tables, empty_b = build_range_tables(batting, "player_id", BATTING_TOTAL_SPLITS)
+    pitching_tables, empty_p = build_range_tables(pitching, "player_id", PITCHING_TOTAL_SPLITS)
+    br_tables, empty_br = build_range_tables(baserunning, "player_id")
+    f_tables, empty_f = build_range_tables(fielding, "player_id")
+    batting_szn_tables, _ = build_range_tables(batting, ["player_id", "season"], BATTING_TOTAL_SPLITS)
+    pitching_szn_tables, _ = build_range_tables(pitching, ["player_id", "season"], PITCHING_TOTAL_SPLITS)
+    br_szn_tables, _ = build_range_tables(baserunning, ["player_id", "season"])
+    f_szn_tables, _ = build_range_tables(fielding, ["player_id", "season"])
+
+    # The flat per-game frames are fully folded into the tables; drop them before the loop grows the output
+    del batting, pitching, baserunning, fielding
+    gc.collect()
 
     print(f"Processing {len(base)} updates...")
     
-    for i, u in base.iterrows():
-        row = u.to_dict()
-        pid = u["mlb_id"]
-        ud = u["update_date"]
-        last = u["last_update"]
+    cols = base.columns.tolist()
+    for u in base.itertuples(index=False, name=None):
+        row = dict(zip(cols, u))
+        pid = row["mlb_id"]
+        ud = row["update_date"]
+        last = row["last_update"]
         
         try:
-            raw_year = int(u["year"])
+            raw_year = int(row["year"])
             year = raw_year + 2000 if raw_year < 100 else raw_year
         except (ValueError, TypeError):
             year = 0
 
         if pid == 0: continue
 
-        b_p = batting[batting.player_id == pid].copy()
-        p_p = pitching[pitching.player_id == pid].copy()
-        br_p = baserunning[baserunning.player_id == pid].copy()
-        f_p = fielding[fielding.player_id == pid].copy()
+        ud_t = ud.to_datetime64()
+        m1_t = (ud - timedelta(days=30)).to_datetime64()
 
-        szn_mask_b = (b_p.season == year) & (b_p.game_date < ud)
-        szn_mask_p = (p_p.season == year) & (p_p.game_date < ud)
-        
-        m1_start = ud - timedelta(days=30)
-        m1_mask_b = (b_p.game_date >= m1_start) & (b_p.game_date < ud)
-        m1_mask_p = (p_p.game_date >= m1_start) & (p_p.game_date < ud)
+        # Season: games of that season before the update
+        szn = (
+            range_sums(batting_szn_tables.get((pid, year), empty_b), end=ud_t),
+            range_sums(pitching_szn_tables.get((pid, year), empty_p), end=ud_t),
+            range_sums(br_szn_tables.get((pid, year), empty_br), end=ud_t),
+            range_sums(f_szn_tables.get((pid, year), empty_f), end=ud_t),
+        )
 
+        # Last 30 days; baserunning/fielding include games on the update date itself
+        b_t = batting_tables.get(pid, empty_b)
+        p_t = pitching_tables.get(pid, empty_p)
+        m1 = (
+            range_sums(b_t, start=m1_t, end=ud_t),
+            range_sums(p_t, start=m1_t, end=ud_t),
+            range_sums(br_tables.get(pid, empty_br), start=m1_t, end=ud_t, end_side="right"),
+            range_sums(f_tables.get(pid, empty_f), start=m1_t, end=ud_t, end_side="right"),
+        )
+
+        # Since the previous update of this card in the same year (else the season so far)
         if pd.notna(last):
-            since_mask_b = (b_p.game_date > last) & (b_p.game_date < ud)
-            since_mask_p = (p_p.game_date > last) & (p_p.game_date < ud)
+            last_t = last.to_datetime64()
+            since = (
+                range_sums(b_t, start=last_t, start_side="right", end=ud_t),
+                range_sums(p_t, start=last_t, start_side="right", end=ud_t),
+                None,
+                None,
+            )
         else:
-            since_mask_b = szn_mask_b
-            since_mask_p = szn_mask_p
-
-        szn_br_df = br_p[(br_p.season == year) & (br_p.game_date < ud)]
-        szn_f_df = f_p[(f_p.season == year) & (f_p.game_date < ud)]
+            since = (szn[0], szn[1], None, None)
 
-        scopes = {
-            "szn_": (b_p[szn_mask_b], p_p[szn_mask_p], szn_br_df, szn_f_df),
-            "m1_": (b_p[m1_mask_b], p_p[m1_mask_p], br_p[br_p.game_date.between(m1_start, ud)], f_p[f_p.game_date.between(m1_start, ud)]),
-            "since_": (b_p[since_mask_b], p_p[since_mask_p], None, None) 
-        }
+        scopes = {"szn_": szn, "m1_": m1, "since_": since}
 
-        for prefix, (b_df, p_df, br_df, f_df) in scopes.items():
-            row.update(agg_batting(b_df, prefix))
-            row.update(agg_pitching(p_df, prefix))
+        for prefix, (b_sums, p_sums, br_sums, f_sums) in scopes.items():
+            row.update(agg_batting(b_sums, prefix))
+            row.update(agg_pitching(p_sums, prefix))
             
-            if br_df is not None: 
-                row.update(agg_baserunning(br_df, prefix))
-            if f_df is not None:
-                row.update(agg_fielding(f_df, prefix))
-
-        rows.append(row)
-
-    final_df = pd.DataFrame(rows)
-
-    final_df["height_inches"] = final_df["height"].apply(height_to_inches)
-    final_df["weight_lbs"] = final_df["weight"].apply(weight_to_lbs)
+            if br_sums is not None: 
+                row.update(agg_baserunning(br_sums, prefix))
+            if f_sums is not None:
+                row.update(agg_fielding(f_sums, prefix))
+
+        for k, v in row.items():
+            col = columns.get(k)
+            if col is None:
+                col = columns[k] = [None] * n_rows
+            elif len(col) < n_rows:
+                col.extend([None] * (n_rows - len(col)))
+            col.append(v)
+        n_rows += 1
+
+    del batting_tables, pitching_tables, br_tables, f_tables
+    del batting_szn_tables, pitching_szn_tables, br_szn_tables, f_szn_tables
+    del base
+    gc.collect()
+
+    for col in columns.values():
+        col.extend([None] * (n_rows - len(col)))
+    final_df = pd.DataFrame(columns)
+    del columns
+
+    final_df["height_inches"] = height_to_inches(final_df["height"])
+    final_df["weight_lbs"] = weight_to_lbs(final_df["weight"])
     
-    pos = final_df["display_position"].fillna("")
+    # One-hots compare small category codes rather than rescanning the string column per flag
+    pos = pd.Categorical(final_df["display_position"].fillna(""))
     sec = final_df["display_secondary_positions"].fillna("")
 
-    final_df["is_sp"] = (pos == "SP").astype(int)
-    final_df["is_rp"] = (pos == "RP").astype(int)
-    final_df["is_if"] = pos.isin(["1B", "2B", "SS", "3B"]).astype(int)
-    final_df["is_of"] = pos.isin(["LF", "CF", "RF"]).astype(int)
+    def pos_flag(names):
+        return np.isin(pos.codes, pos.categories.get_indexer(names)).astype(int)
+
+    final_df["is_sp"] = pos_flag(["SP"])
+    final_df["is_rp"] = pos_flag(["RP"])
+    final_df["is_if"] = pos_flag(["1B", "2B", "SS", "3B"])
+    final_df["is_of"] = pos_flag(["LF", "CF", "RF"])
     final_df["multi_pos"] = sec.ne("").astype(int)
 
+    age = final_df["age"].to_numpy()
     final_df["age_sq"] = final_df["age"] ** 2
-    final_df["age_bucket_young"] = (final_df["age"] < 26).astype(int)
-    final_df["age_bucket_prime"] = final_df["age"].between(26, 30).astype(int)
-    final_df["age_bucket_old"] = (final_df["age"] > 30).astype(int)
+    final_df["age_bucket_young"] = (age < 26).astype(int)
+    final_df["age_bucket_prime"] = ((age >= 26) & (age <= 30)).astype(int)
+    final_df["age_bucket_old"] = (age > 30).astype(int)
 
     final_df = final_df.fillna(0)
 